@@ -15,8 +15,11 @@ Subcommands (stubs):
 from __future__ import annotations
 
 import argparse
+import sys
 from typing import List, Optional
 
+STUB_CMDS = {"ingest", "enrich", "index", "search", "search-hybrid", "resolve"}
+
 
 def _add_subcommands(parser: argparse.ArgumentParser) -> None:
     sub = parser.add_subparsers(dest="cmd", metavar="command")
@@ -69,6 +72,13 @@ def _print_stub(name: str) -> None:
 
 
 def main(argv: Optional[List[str]] = None) -> int:
+    if argv is None:
+        argv = sys.argv[1:]
+    # Fast path: stub subcommands only print a message, so skip the
+    # argparse tree (7 subparsers) entirely for scripted invocations.
+    if argv and argv[0] in STUB_CMDS:
+        _print_stub(argv[0])
+        return 0
     parser = argparse.ArgumentParser(
         prog="krpc-snippets",
         description=(
@@ -90,7 +100,7 @@ def main(argv: Optional[List[str]] = None) -> int:
         return 0
 
     cmd = args.cmd
-    if cmd in {"ingest", "enrich", "index", "search", "search-hybrid", "resolve"}:
+    if cmd in STUB_CMDS:
         _print_stub(cmd)
         return 0
 
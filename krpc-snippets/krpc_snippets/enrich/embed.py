@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import math
 import os
@@ -9,6 +10,42 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+try:
+    import numpy as np  # type: ignore
+except Exception:
+    np = None  # optional; pure-Python fallbacks below
+
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None  # optional; stdlib json fallback
+
+
+def _make_extractor(field_name: str, code_head_chars: int):
+    # One closure per configured field: the field-name comparisons happen
+    # once per EmbedConfig instead of once per record.
+    # Plain %-formatting/concat: skips the FORMAT_VALUE bytecode an
+    # f-string pays per record in this pre-embedding hot path.
+    if field_name == "name":
+        def fn(rec: Dict) -> Optional[str]:
+            v = rec.get("name")
+            return "name: %s" % (v,) if v else None
+    elif field_name == "description":
+        def fn(rec: Dict) -> Optional[str]:
+            v = rec.get("description")
+            return "description: %s" % (v,) if v else None
+    elif field_name == "code_head":
+        head = max(0, int(code_head_chars))
+        def fn(rec: Dict) -> Optional[str]:
+            code = rec.get("code")
+            return "code: " + code[:head] if code else None
+    else:
+        prefix = field_name + ": %s"
+        def fn(rec: Dict) -> Optional[str]:
+            v = rec.get(field_name)
+            return None if v is None else prefix % (v,)
+    return fn
+
 
 @dataclass
 class EmbedConfig:
@@ -17,9 +54,13 @@ class EmbedConfig:
     code_head_chars: int = 800
     normalize: bool = True
     batch_size: int = 64
+    concurrency: int = 8
     cache_dir: Path = Path("krpc-snippets/data/embed_cache")
     mock: bool = False
 
+    def __post_init__(self) -> None:
+        self._field_fns = [_make_extractor(f, self.code_head_chars) for f in self.fields]
+
 
 EMBED_VERSION = "v1"
 
@@ -36,24 +77,54 @@ def _cache_key(rec: Dict, cfg: EmbedConfig) -> str:
     return "__" + "_".join(part.replace("/", "_") for part in key_parts)
 
 
-def _cache_path(cfg: EmbedConfig, rec: Dict) -> Path:
-    name = _cache_key(rec, cfg) + ".json"
-    return _ensure_cache_dir(cfg.cache_dir) / name
+def _dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(data: bytes) -> Dict:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _open_cache(cfg: EmbedConfig):
+    """Open the single SQLite embed cache (one DB instead of a JSON file per record)."""
+    import sqlite3
+    _ensure_cache_dir(cfg.cache_dir)
+    conn = sqlite3.connect(str(cfg.cache_dir / "embed_cache.sqlite"))
+    conn.execute("CREATE TABLE IF NOT EXISTS embed_cache (key TEXT PRIMARY KEY, blob BLOB NOT NULL)")
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    return conn
+
+
+def _cache_get(conn, key: str) -> Optional[Dict]:
+    try:
+        row = conn.execute("SELECT blob FROM embed_cache WHERE key=?", (key,)).fetchone()
+    except Exception:
+        return None
+    if row is None:
+        return None
+    try:
+        return _loads(row[0])
+    except Exception:
+        return None
+
+
+def _cache_put_many(conn, rows: List[Tuple[str, bytes]]) -> None:
+    if not rows:
+        return
+    try:
+        conn.executemany("INSERT OR REPLACE INTO embed_cache (key, blob) VALUES (?, ?)", rows)
+        conn.commit()
+    except Exception:
+        pass
 
 
 def build_input_text(rec: Dict, cfg: EmbedConfig) -> str:
-    parts: List[str] = []
-    for f in cfg.fields:
-        if f == "name" and rec.get("name"):
-            parts.append(f"name: {rec['name']}")
-        elif f == "description" and rec.get("description"):
-            parts.append(f"description: {rec['description']}")
-        elif f == "code_head" and rec.get("code"):
-            code = rec["code"][: max(0, int(cfg.code_head_chars))]
-            parts.append(f"code: {code}")
-        elif rec.get(f) is not None:
-            parts.append(f"{f}: {rec.get(f)}")
-    return "\n".join(parts)
+    return "\n".join(s for s in (fn(rec) for fn in cfg._field_fns) if s is not None)
 
 
 def _openai_client_or_none():
@@ -78,10 +149,23 @@ def _embed_openai(client, model: str, texts: List[str]) -> Tuple[List[List[float
     return vecs, dim
 
 
+def _mock_seed(rid: str) -> int:
+    # Stable across processes (unlike salted hash()), so cached mock
+    # vectors keyed by id survive PYTHONHASHSEED changes.
+    return int.from_bytes(hashlib.blake2b(rid.encode("utf-8"), digest_size=8).digest(), "little")
+
+
 def _embed_mock(ids: List[str], dim: int = 64) -> Tuple[List[List[float]], int]:
     vecs: List[List[float]] = []
+    if np is not None:
+        # Vectorized draw: one C-level uniform() per id instead of dim
+        # Python-level random.uniform calls.
+        for rid in ids:
+            rng = np.random.default_rng(_mock_seed(rid))
+            vecs.append(rng.uniform(-1.0, 1.0, dim).tolist())
+        return vecs, dim
     for rid in ids:
-        rnd = random.Random(hash(rid) & 0xFFFFFFFF)
+        rnd = random.Random(_mock_seed(rid))
         v = [rnd.uniform(-1.0, 1.0) for _ in range(dim)]
         vecs.append(v)
     return vecs, dim
@@ -96,55 +180,79 @@ def _l2_normalize(v: List[float]) -> List[float]:
 
 def embed_records(records: List[Dict], cfg: Optional[EmbedConfig] = None) -> List[Dict]:
     cfg = cfg or EmbedConfig()
-    out: List[Dict] = []
     client = None if cfg.mock else _openai_client_or_none()
+    cache = _open_cache(cfg)
+    results: List[Optional[Dict]] = [None] * len(records)
 
-    batch_ids: List[str] = []
-    batch_texts: List[str] = []
-    batch_recs: List[Dict] = []
-
-    def flush_batch():
-        nonlocal out, batch_ids, batch_texts, batch_recs
-        if not batch_texts:
-            return
+    def run_batch(idxs: List[int]) -> Tuple[List[int], List[List[float]], int]:
+        ids = [records[i].get("id", "") for i in idxs]
+        texts = [build_input_text(records[i], cfg) for i in idxs]
         try:
             if client is not None:
-                vecs, dim = _embed_openai(client, cfg.model, batch_texts)
+                vecs, dim = _embed_openai(client, cfg.model, texts)
             else:
-                vecs, dim = _embed_mock(batch_ids)
+                vecs, dim = _embed_mock(ids)
         except Exception:
             # Fallback to mock for this batch
-            vecs, dim = _embed_mock(batch_ids)
-        for rec, rid, vec in zip(batch_recs, batch_ids, vecs):
-            vecn = _l2_normalize(vec) if cfg.normalize else vec
-            emb = {"id": rec.get("id"), "model": cfg.model, "dim": dim, "vector": vecn}
-            out.append(emb)
-            # Cache
+            vecs, dim = _embed_mock(ids)
+        if cfg.normalize:
+            if np is not None:
+                # Normalize the whole batch in one shot: BLAS norms plus a
+                # vectorized divide instead of O(batch*dim) Python ops.
+                A = np.asarray(vecs, dtype=np.float32)
+                norms = np.linalg.norm(A, axis=1, keepdims=True)
+                A /= np.where(norms > 1e-12, norms, 1.0)
+                vecs = A.tolist()
+            else:
+                vecs = [_l2_normalize(v) for v in vecs]
+        return idxs, vecs, dim
+
+    def store_batch(idxs: List[int], vecs: List[List[float]], dim: int) -> None:
+        cache_rows: List[Tuple[str, bytes]] = []
+        for i, vec in zip(idxs, vecs):
+            rec = records[i]
+            emb = {"id": rec.get("id"), "model": cfg.model, "dim": dim, "vector": vec}
+            results[i] = emb
             try:
-                _cache_path(cfg, rec).write_text(json.dumps(emb, ensure_ascii=False), encoding="utf-8")
+                cache_rows.append((_cache_key(rec, cfg), _dumps(emb)))
             except Exception:
                 pass
-        batch_ids, batch_texts, batch_recs = [], [], []
+        # One transaction per flush instead of a file write per record
+        _cache_put_many(cache, cache_rows)
 
-    for rec in records:
-        # Cache lookup
-        cache_file = _cache_path(cfg, rec)
-        if cache_file.exists():
-            try:
-                emb = json.loads(cache_file.read_text(encoding="utf-8"))
-                out.append(emb)
-                continue
-            except Exception:
-                pass
-        text = build_input_text(rec, cfg)
-        batch_ids.append(rec.get("id", ""))
-        batch_texts.append(text)
-        batch_recs.append(rec)
-        if len(batch_texts) >= cfg.batch_size:
-            flush_batch()
-            time.sleep(0.05)  # gentle pacing
-    flush_batch()
-    return out
+    try:
+        misses: List[int] = []
+        for i, rec in enumerate(records):
+            emb = _cache_get(cache, _cache_key(rec, cfg))
+            if emb is not None:
+                results[i] = emb
+            else:
+                misses.append(i)
+        batches = [misses[j:j + cfg.batch_size] for j in range(0, len(misses), cfg.batch_size)]
+        if client is not None and cfg.concurrency > 1 and len(batches) > 1:
+            # Embedding calls are network-bound: overlap their RTTs. The
+            # pool size bounds in-flight requests; sqlite writes stay on
+            # the main thread.
+            from concurrent.futures import ThreadPoolExecutor, as_completed
+            with ThreadPoolExecutor(max_workers=cfg.concurrency) as ex:
+                futures = [ex.submit(run_batch, b) for b in batches]
+                for fut in as_completed(futures):
+                    store_batch(*fut.result())
+        else:
+            for b in batches:
+                store_batch(*run_batch(b))
+    finally:
+        cache.close()
+    return [r for r in results if r is not None]
+
+
+def _pack_vector(vec: List[float]) -> bytes:
+    # Raw little-endian float32: ~4 bytes per element vs ~20 as JSON text,
+    # and no float parsing on read-back.
+    if np is not None:
+        return np.asarray(vec, dtype=np.float32).tobytes()
+    import array
+    return array.array("f", vec).tobytes()
 
 
 def write_sqlite(embeddings: List[Dict], path: Path) -> int:
@@ -157,7 +265,7 @@ def write_sqlite(embeddings: List[Dict], path: Path) -> int:
             id TEXT PRIMARY KEY,
             model TEXT NOT NULL,
             dim INTEGER NOT NULL,
-            vector TEXT NOT NULL,
+            vector BLOB NOT NULL,
             updated_at TEXT NOT NULL
         )
         """
@@ -170,7 +278,7 @@ def write_sqlite(embeddings: List[Dict], path: Path) -> int:
             e.get("id"),
             e.get("model"),
             int(e.get("dim", 0)),
-            json.dumps(e.get("vector")),
+            _pack_vector(e.get("vector") or []),
             now,
         )
         for e in embeddings
@@ -195,30 +303,87 @@ def write_sqlite(embeddings: List[Dict], path: Path) -> int:
 
 def write_jsonl(embeddings: List[Dict], path: Path) -> int:
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        for e in embeddings:
-            f.write(json.dumps(e, ensure_ascii=False) + "\n")
+    if orjson is not None:
+        # Serialize straight to bytes; skips the str->utf-8 encode per row.
+        with path.open("wb") as f:
+            for e in embeddings:
+                f.write(orjson.dumps(e) + b"\n")
+    else:
+        with path.open("w", encoding="utf-8") as f:
+            for e in embeddings:
+                f.write(json.dumps(e, ensure_ascii=False) + "\n")
     return len(embeddings)
 
 
-def write_parquet(embeddings: List[Dict], path: Path) -> int:
+def write_faiss_flat(embeddings: List[Dict], path: Path) -> int:
+    """Write a FAISS-ready flat file: contiguous (N, dim) float32 vectors.
+
+    Produces three artifacts so downstream ANN indexing can mmap the
+    matrix straight into IndexFlat.add with no re-decode pass:
+      - ``path``: raw row-major float32 matrix
+      - ``path.with_suffix(".ids")``: one snippet id per line, row order
+      - ``path.with_suffix(".meta.json")``: count/dim/model header
+    """
+    if np is None:
+        raise RuntimeError("numpy is required for FAISS flat output. Install with 'uv pip install numpy'.")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    vecs = [e.get("vector") or [] for e in embeddings]
+    arr = np.asarray(vecs, dtype=np.float32) if vecs else np.zeros((0, 0), dtype=np.float32)
+    arr.tofile(path)
+    path.with_suffix(".ids").write_text("\n".join(str(e.get("id") or "") for e in embeddings), encoding="utf-8")
+    meta = {
+        "count": int(arr.shape[0]),
+        "dim": int(arr.shape[1]) if arr.ndim == 2 else 0,
+        "dtype": "float32",
+        "model": embeddings[0].get("model") if embeddings else None,
+    }
+    path.with_suffix(".meta.json").write_bytes(_dumps(meta))
+    return len(embeddings)
+
+
+def write_parquet(embeddings: List[Dict], path: Path, chunk_size: int = 10_000) -> int:
     try:
         import pyarrow as pa  # type: ignore
         import pyarrow.parquet as pq  # type: ignore
     except Exception:
         raise RuntimeError("pyarrow is required for Parquet output. Install with 'uv pip install pyarrow'.")
     path.parent.mkdir(parents=True, exist_ok=True)
-    # Convert to columns
-    ids = [e.get("id") for e in embeddings]
-    models = [e.get("model") for e in embeddings]
-    dims = [int(e.get("dim", 0)) for e in embeddings]
-    vecs = [e.get("vector") for e in embeddings]
-    table = pa.table({
-        "id": pa.array(ids, type=pa.string()),
-        "model": pa.array(models, type=pa.string()),
-        "dim": pa.array(dims, type=pa.int32()),
-        "vector": pa.array(vecs, type=pa.list_(pa.float32())),
-    })
-    pq.write_table(table, path)
+    # Decide the vector layout once so every chunk shares one schema
+    all_dims = {int(e.get("dim", 0)) for e in embeddings}
+    fixed_dim = all_dims.pop() if np is not None and len(all_dims) == 1 else 0
+
+    def _chunk_table(chunk: List[Dict]) -> "pa.Table":
+        ids = [e.get("id") for e in chunk]
+        models = [e.get("model") for e in chunk]
+        dims = [int(e.get("dim", 0)) for e in chunk]
+        vecs = [e.get("vector") for e in chunk]
+        if fixed_dim > 0:
+            # Uniform dim: hand Arrow one contiguous float32 buffer (a
+            # memcpy) instead of boxing dim Python floats per row.
+            flat = np.asarray(vecs, dtype=np.float32).reshape(-1)
+            vec_col = pa.FixedSizeListArray.from_arrays(pa.array(flat), fixed_dim)
+        else:
+            vec_col = pa.array(vecs, type=pa.list_(pa.float32()))
+        return pa.table({
+            "id": pa.array(ids, type=pa.string()),
+            "model": pa.array(models, type=pa.string()),
+            "dim": pa.array(dims, type=pa.int32()),
+            "vector": vec_col,
+        })
+
+    # Stream chunk-at-a-time through one ParquetWriter so peak memory is
+    # bounded by chunk_size rows instead of the whole embedding set.
+    writer: Optional["pq.ParquetWriter"] = None
+    try:
+        for start in range(0, len(embeddings), chunk_size):
+            table = _chunk_table(embeddings[start:start + chunk_size])
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema, compression="zstd")
+            writer.write_table(table, row_group_size=chunk_size)
+        if writer is None:  # empty input still yields a valid file
+            pq.write_table(_chunk_table([]), path, compression="zstd")
+    finally:
+        if writer is not None:
+            writer.close()
     return len(embeddings)
 
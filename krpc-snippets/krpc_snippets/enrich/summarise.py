@@ -7,6 +7,11 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None  # optional; stdlib json fallback
+
 
 @dataclass
 class SummarizerConfig:
@@ -23,7 +28,7 @@ PROMPT_VERSION = "v1"
 
 
 def _cache_path(cfg: SummarizerConfig, snip_id: str) -> Path:
-    cfg.cache_dir.mkdir(parents=True, exist_ok=True)
+    # Caller ensures cache_dir exists; keep this a pure path computation.
     name = f"{snip_id}.{PROMPT_VERSION}.{cfg.model.replace('/', '_')}.json"
     return cfg.cache_dir / name
 
@@ -124,17 +129,30 @@ def _merge_fields(rec: Dict, enriched: Dict, *, only_if_empty: bool) -> Dict:
 def summarise_snippets(snippets: List[Dict], cfg: Optional[SummarizerConfig] = None) -> List[Dict]:
     cfg = cfg or SummarizerConfig()
     client = None if cfg.mock else _openai_client_or_none()
+    cfg.cache_dir.mkdir(parents=True, exist_ok=True)  # once, not per record
     out: List[Dict] = []
     for rec in snippets:
         # Skip if only_if_empty and description already exists
         if cfg.only_if_empty and (rec.get("description") or "").strip():
             out.append(rec)
             continue
-        cache_file = _cache_path(cfg, rec.get("id", hashlib.sha256(json.dumps(rec, sort_keys=True).encode()).hexdigest()))
+        rid = rec.get("id")
+        if not rid:
+            # Only fingerprint records that actually lack an id; as a .get
+            # default the full-record serialization ran unconditionally.
+            if orjson is not None:
+                payload = orjson.dumps(rec, option=orjson.OPT_SORT_KEYS)
+            else:
+                payload = json.dumps(rec, sort_keys=True).encode()
+            rid = hashlib.blake2b(payload, digest_size=16).hexdigest()
+        cache_file = _cache_path(cfg, rid)
         enriched: Optional[Dict] = None
         if cache_file.exists():
             try:
-                enriched = json.loads(cache_file.read_text(encoding="utf-8"))
+                if orjson is not None:
+                    enriched = orjson.loads(cache_file.read_bytes())
+                else:
+                    enriched = json.loads(cache_file.read_text(encoding="utf-8"))
             except Exception:
                 enriched = None
         if enriched is None:
@@ -143,7 +161,10 @@ def summarise_snippets(snippets: List[Dict], cfg: Optional[SummarizerConfig] = N
             if enriched is None:
                 enriched = _mock_summary(rec)
             try:
-                cache_file.write_text(json.dumps(enriched, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+                if orjson is not None:
+                    cache_file.write_bytes(orjson.dumps(enriched, option=orjson.OPT_INDENT_2) + b"\n")
+                else:
+                    cache_file.write_text(json.dumps(enriched, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
             except Exception:
                 pass
         out.append(_merge_fields(rec, enriched, only_if_empty=cfg.only_if_empty))
@@ -1,48 +1,125 @@
 from __future__ import annotations
 
+import functools
 import math
-from typing import Iterable, List, Dict, Any
+from typing import Iterable, List, Dict, Any, Sequence
+
+try:
+    import numpy as np  # type: ignore
+except Exception:
+    np = None  # optional; batch variants fall back to per-query loops
+
+
+def _id_from_str(r: str) -> str:
+    return r
+
+
+def _id_from_dict(r: Dict) -> Any:
+    rid = r.get("id")
+    return str(rid) if rid else None
+
+
+def _id_from_seq(r: Any) -> Any:
+    return str(r[0]) if r else None
+
+
+# Exact-type dispatch: one dict lookup instead of up to four isinstance
+# checks per element in the metric inner loops.
+_EXTRACTORS = {str: _id_from_str, dict: _id_from_dict, tuple: _id_from_seq, list: _id_from_seq}
 
 
 def _extract_ids(results: Iterable[Any]) -> List[str]:
     out: List[str] = []
+    append = out.append
     for r in results:
-        if isinstance(r, str):
-            out.append(r)
-        elif isinstance(r, dict):
-            rid = r.get("id")
-            if rid:
-                out.append(str(rid))
-        elif isinstance(r, (tuple, list)) and r:
-            out.append(str(r[0]))
+        fn = _EXTRACTORS.get(type(r))
+        if fn is None:
+            # Subclasses and anything exotic take the slow isinstance path
+            if isinstance(r, str):
+                fn = _id_from_str
+            elif isinstance(r, dict):
+                fn = _id_from_dict
+            elif isinstance(r, (tuple, list)):
+                fn = _id_from_seq
+            else:
+                continue
+        rid = fn(r)
+        if rid is not None:
+            append(rid)
     return out
 
 
-def topk_accuracy(results: Iterable[Any], expected_ids: Iterable[str], k: int) -> float:
+def topk_accuracy(results: Iterable[Any], expected_ids: Iterable[str], k: int, *, _exp: Any = None) -> float:
     ids = _extract_ids(results)[:k]
-    exp = set(str(x) for x in expected_ids)
+    exp = _exp if _exp is not None else frozenset(str(x) for x in expected_ids)
     return 1.0 if any(i in exp for i in ids) else 0.0
 
 
-def mrr(results: Iterable[Any], expected_ids: Iterable[str]) -> float:
+def mrr(results: Iterable[Any], expected_ids: Iterable[str], *, _exp: Any = None) -> float:
     ids = _extract_ids(results)
-    exp = set(str(x) for x in expected_ids)
+    exp = _exp if _exp is not None else frozenset(str(x) for x in expected_ids)
     for i, rid in enumerate(ids, start=1):
         if rid in exp:
             return 1.0 / i
     return 0.0
 
 
-def ndcg_at_k(results: Iterable[Any], expected_ids: Iterable[str], k: int) -> float:
+@functools.lru_cache(maxsize=256)
+def _binary_idcg(R: int) -> float:
+    # Ideal DCG for binary relevance: all R relevant results at the top.
+    return sum(1.0 / math.log2(i + 1) for i in range(1, R + 1))
+
+
+def ndcg_at_k(results: Iterable[Any], expected_ids: Iterable[str], k: int, *, _exp: Any = None) -> float:
     ids = _extract_ids(results)[:k]
-    exp = set(str(x) for x in expected_ids)
-    dcg = 0.0
-    for i, rid in enumerate(ids, start=1):
-        rel = 1.0 if rid in exp else 0.0
-        if rel > 0:
-            dcg += (2 ** rel - 1) / math.log2(1 + i)
-    # Ideal DCG: all relevant (binary) at top
-    R = min(len(exp), k)
-    idcg = sum((2 ** 1 - 1) / math.log2(1 + i) for i in range(1, R + 1))
+    exp = _exp if _exp is not None else frozenset(str(x) for x in expected_ids)
+    # Binary relevance: 2**rel - 1 == 1, so the gain is just the discount
+    dcg = sum(1.0 / math.log2(i + 1) for i, rid in enumerate(ids, start=1) if rid in exp)
+    idcg = _binary_idcg(min(len(exp), k))
     return (dcg / idcg) if idcg > 0 else 0.0
 
+
+def _hit_matrix(all_results: Sequence[Iterable[Any]], all_expected: Sequence[Iterable[str]], k: int):
+    # (Q, k) binary relevance matrix; set membership per cell is cheap,
+    # the win is doing all reductions below as NumPy column ops.
+    hit = np.zeros((len(all_results), k), dtype=bool)
+    for q, (results, expected) in enumerate(zip(all_results, all_expected)):
+        exp = set(str(x) for x in expected)
+        for j, rid in enumerate(_extract_ids(results)[:k]):
+            if rid in exp:
+                hit[q, j] = True
+    return hit
+
+
+def topk_accuracy_batch(all_results: Sequence[Iterable[Any]], all_expected: Sequence[Iterable[str]], k: int) -> float:
+    """Mean top-k accuracy over many queries in one vectorized pass."""
+    if not all_results:
+        return 0.0
+    if np is None:
+        return sum(topk_accuracy(r, e, k) for r, e in zip(all_results, all_expected)) / len(all_results)
+    return float(_hit_matrix(all_results, all_expected, k).any(axis=1).mean())
+
+
+def mrr_batch(all_results: Sequence[Iterable[Any]], all_expected: Sequence[Iterable[str]], k: int) -> float:
+    """Mean reciprocal rank over many queries, truncated at rank k."""
+    if not all_results:
+        return 0.0
+    if np is None:
+        return sum(mrr(list(r)[:k], e) for r, e in zip(all_results, all_expected)) / len(all_results)
+    hit = _hit_matrix(all_results, all_expected, k)
+    any_hit = hit.any(axis=1)
+    first = hit.argmax(axis=1) + 1
+    return float(np.where(any_hit, 1.0 / first, 0.0).mean())
+
+
+def ndcg_at_k_batch(all_results: Sequence[Iterable[Any]], all_expected: Sequence[Iterable[str]], k: int) -> float:
+    """Mean nDCG@k over many queries in one vectorized pass."""
+    if not all_results:
+        return 0.0
+    if np is None:
+        return sum(ndcg_at_k(r, e, k) for r, e in zip(all_results, all_expected)) / len(all_results)
+    hit = _hit_matrix(all_results, all_expected, k)
+    discounts = 1.0 / np.log2(np.arange(2, k + 2))
+    dcg = (hit * discounts).sum(axis=1)
+    idcg = np.array([_binary_idcg(min(len(set(str(x) for x in e)), k)) for e in all_expected])
+    return float(np.where(idcg > 0, dcg / np.maximum(idcg, 1e-12), 0.0).mean())
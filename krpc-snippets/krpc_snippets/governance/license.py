@@ -68,7 +68,17 @@ HEURISTICS: List[Tuple[str, str]] = [
 ]
 
 
+# Single alternation compiled once: one scan over the text instead of one
+# re.search (and recompile) per heuristic pattern.
+HEURISTICS_RE = re.compile(
+    "|".join(f"(?P<g{i}>{pattern})" for i, (pattern, _) in enumerate(HEURISTICS)),
+    flags=re.I | re.S,
+)
+HEURISTIC_SPDX: List[str] = [spdx for _, spdx in HEURISTICS]
+
+
 SPDX_HEADER_RE = re.compile(r"SPDX-License-Identifier:\s*([A-Za-z0-9+\.-]+)")
+SPDX_HEADER_RE_B = re.compile(rb"SPDX-License-Identifier:\s*([A-Za-z0-9+\.-]+)")
 
 
 @dataclass
@@ -83,17 +93,14 @@ class LicenseInfo:
 
 def detect_spdx_in_header(file_path: Path, max_lines: int = 20) -> Optional[str]:
     try:
-        with file_path.open("r", encoding="utf-8", errors="ignore") as f:
-            for i in range(max_lines):
-                line = f.readline()
-                if not line:
-                    break
-                m = SPDX_HEADER_RE.search(line)
-                if m:
-                    return _normalize_spdx(m.group(1))
+        with file_path.open("rb") as f:
+            # One binary read + one bytes-regex pass over the header; no
+            # decode, no readline loop (~100 bytes per header line is ample).
+            head = f.read(max(2048, 100 * max_lines))
     except Exception:
         return None
-    return None
+    m = SPDX_HEADER_RE_B.search(head)
+    return _normalize_spdx(m.group(1).decode("ascii", "ignore")) if m else None
 
 
 def _detect_from_license_files(repo_root: Path) -> Optional[LicenseInfo]:
@@ -115,11 +122,11 @@ def _detect_from_license_files(repo_root: Path) -> Optional[LicenseInfo]:
         url = SPDX_URL.get(spdx, "")
         return LicenseInfo(spdx_id=spdx, name=spdx, url=url, restricted=_is_restricted(spdx), source="LICENSE_FILE", file_path=str(chosen))
     # Heuristics
-    for pattern, spdx in HEURISTICS:
-        if re.search(pattern, text, flags=re.I | re.S):
-            spdx = _normalize_spdx(spdx)
-            url = SPDX_URL.get(spdx, "")
-            return LicenseInfo(spdx_id=spdx, name=spdx, url=url, restricted=_is_restricted(spdx), source="HEURISTIC", file_path=str(chosen))
+    m = HEURISTICS_RE.search(text)
+    if m:
+        spdx = _normalize_spdx(HEURISTIC_SPDX[int(m.lastgroup[1:])])
+        url = SPDX_URL.get(spdx, "")
+        return LicenseInfo(spdx_id=spdx, name=spdx, url=url, restricted=_is_restricted(spdx), source="HEURISTIC", file_path=str(chosen))
     return LicenseInfo(spdx_id="UNKNOWN", name="UNKNOWN", url="", restricted=False, source="UNKNOWN", file_path=str(chosen))
 
 
@@ -141,14 +148,33 @@ def detect_repo_license(repo_root: Path) -> LicenseInfo:
 
 
 def summarize_repo_license(repo_root: Path) -> Dict[str, object]:
-    lic = detect_repo_license(repo_root)
-    # spdx coverage among files
-    total_py = 0
+    repo_root = repo_root.resolve()
+    lic = _detect_from_license_files(repo_root)
+    # Single walk: each header is opened and scanned once, serving both
+    # license detection (fallback) and SPDX coverage counting. Header
+    # reads are I/O-bound, so large repos scan on a thread pool.
+    py_files = list(repo_root.rglob("*.py"))
+    total_py = len(py_files)
     spdx_hits = 0
-    for fp in repo_root.rglob("*.py"):
-        total_py += 1
-        if detect_spdx_in_header(fp):
+    first_spdx: Optional[Tuple[str, Path]] = None
+    if len(py_files) > 16:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(8, len(py_files))) as ex:
+            spdx_results = list(ex.map(detect_spdx_in_header, py_files))
+    else:
+        spdx_results = [detect_spdx_in_header(fp) for fp in py_files]
+    for fp, spdx in zip(py_files, spdx_results):
+        if spdx:
             spdx_hits += 1
+            if first_spdx is None:
+                first_spdx = (spdx, fp)
+    if lic is None or lic.spdx_id == "UNKNOWN":
+        if first_spdx is not None:
+            spdx, fp = first_spdx
+            url = SPDX_URL.get(spdx, "")
+            lic = LicenseInfo(spdx_id=spdx, name=spdx, url=url, restricted=_is_restricted(spdx), source="SPDX_HEADER", file_path=str(fp.relative_to(repo_root)))
+        elif lic is None:
+            lic = LicenseInfo(spdx_id="UNKNOWN", name="UNKNOWN", url="", restricted=False, source="UNKNOWN")
     return {
         "license": lic.__dict__,
         "spdx_headers": {"files_with_spdx": spdx_hits, "total_py_files": total_py},
@@ -1,45 +1,53 @@
 from __future__ import annotations
 
+import functools
 import json
 import math
+import pickle
 import re
+from collections import defaultdict
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
+try:
+    import numpy as np  # type: ignore
+except Exception:
+    np = None  # optional; search falls back to the dict postings path
 
-_TOKEN_RE = re.compile(r"[A-Za-z0-9_]+")
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None  # optional; save/load fall back to streaming stdlib json
 
+# Below this corpus size the packed path's setup cost outweighs its win.
+_PACKED_MIN_DOCS = 64
+
+try:  # optional JIT for the posting-accumulation kernel
+    import numba  # type: ignore
+
+    @numba.njit(cache=True, fastmath=True)
+    def _score_kernel(doc_ids, weights, offsets, lengths, idfs, out):  # pragma: no cover - compiled
+        for qi in range(offsets.shape[0]):
+            o = offsets[qi]
+            idf = idfs[qi]
+            for i in range(o, o + lengths[qi]):
+                out[doc_ids[i]] += weights[i] * idf
+except Exception:
+    _score_kernel = None
 
-def _split_camel(token: str) -> List[str]:
-    # Split CamelCase and snake_case tokens into lowercase pieces
-    # Example: NavHelper -> [nav, helper]
-    parts: List[str] = []
-    buf = ""
-    for ch in token:
-        if ch.isupper() and buf and not buf[-1].isupper():
-            parts.append(buf)
-            buf = ch.lower()
-        else:
-            buf += ch.lower()
-    if buf:
-        parts.append(buf)
-    # Split underscores inside
-    out: List[str] = []
-    for p in parts:
-        out.extend([s for s in p.split("_") if s])
-    return out
+
+# One C-regex pass that emits camel/snake pieces directly: an acronym run
+# before a capitalized word (HTTPServer -> HTTP), a capitalized or lower
+# word with digits (Nav, nav2), a trailing acronym run, or bare digits.
+# Underscores and other separators simply never match.
+_ID_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z0-9]+|[A-Z]+|[0-9]+")
 
 
 def _tokenize(text: str) -> List[str]:
-    toks: List[str] = []
-    for m in _TOKEN_RE.findall(text or ""):
-        if not m:
-            continue
-        for s in _split_camel(m):
-            if s:
-                toks.append(s)
-    return toks
+    # Split CamelCase and snake_case into lowercase pieces in a single
+    # findall; e.g. NavHelper -> [nav, helper], HTTPServer -> [http, server]
+    return [t.lower() for t in _ID_RE.findall(text or "")]
 
 
 @dataclass
@@ -50,9 +58,36 @@ class KeywordConfig:
     weight_description: float = 1.0
     weight_code_head: float = 0.5
     code_head_chars: int = 300
-    stopwords: List[str] = field(default_factory=lambda: [
+    # Frozenset: membership is tested once per token during indexing and
+    # querying, and the set doubles as the _stop_re cache key
+    stopwords: FrozenSet[str] = field(default_factory=lambda: frozenset({
         "the", "and", "or", "to", "of", "a", "in", "on", "for", "with", "by",
-    ])
+    }))
+
+    def __post_init__(self) -> None:
+        # Accept lists from JSON round-trips (save/load, wtf cache)
+        self.stopwords = frozenset(self.stopwords)
+
+    def as_dict(self) -> Dict:
+        # JSON-able view; frozensets do not serialize directly
+        d = dict(self.__dict__)
+        d["stopwords"] = sorted(self.stopwords)
+        return d
+
+
+@dataclass
+class PackedPostings:
+    """Flat struct-of-arrays postings: int32 doc ids + float32 weights.
+
+    Replaces ~80-byte dict entries with 8 packed bytes per posting and
+    lets scoring run as NumPy bincount over contiguous slices.
+    """
+
+    doc_rids: List[str]  # doc index -> snippet id
+    term_span: Dict[str, Tuple[int, int]]  # term -> (offset, length)
+    doc_ids: "np.ndarray"
+    weights: "np.ndarray"
+    restricted: "np.ndarray"
 
 
 @dataclass
@@ -63,64 +98,203 @@ class KeywordIndex:
     N: int
     cfg: KeywordConfig
 
+    def packed(self) -> Optional[PackedPostings]:
+        """Build (once) the flat SoA view of the postings for fast scoring."""
+        if np is None:
+            return None
+        cached = getattr(self, "_packed", None)
+        if cached is not None:
+            return cached
+        doc_rids = list(self.docs.keys())
+        idx_of = {rid: i for i, rid in enumerate(doc_rids)}
+        term_span: Dict[str, Tuple[int, int]] = {}
+        ids_parts: List[int] = []
+        w_parts: List[float] = []
+        offset = 0
+        for t, postings in self.vocab.items():
+            n = 0
+            for rid, w in postings.items():
+                i = idx_of.get(rid)
+                if i is None:
+                    continue
+                ids_parts.append(i)
+                w_parts.append(w)
+                n += 1
+            term_span[t] = (offset, n)
+            offset += n
+        packed = PackedPostings(
+            doc_rids=doc_rids,
+            term_span=term_span,
+            doc_ids=np.asarray(ids_parts, dtype=np.int32),
+            weights=np.asarray(w_parts, dtype=np.float32),
+            restricted=np.fromiter(
+                (bool(self.docs[r].get("restricted")) for r in doc_rids),
+                dtype=bool, count=len(doc_rids),
+            ),
+        )
+        self._packed = packed
+        return packed
+
     def save(self, path: Path) -> None:
         data = {
             "vocab": self.vocab,
             "df": self.df,
             "docs": self.docs,
             "N": self.N,
-            "cfg": self.cfg.__dict__,
+            "cfg": self.cfg.as_dict(),
         }
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        if orjson is not None:
+            # C-level encoder straight to bytes; no intermediate str copy
+            path.write_bytes(orjson.dumps(data))
+            return
+        # Stream the stdlib encoder into the file so we never hold the
+        # whole serialized index as one giant Python string
+        with path.open("w", encoding="utf-8") as f:
+            for chunk in json.JSONEncoder(ensure_ascii=False).iterencode(data):
+                f.write(chunk)
 
     @staticmethod
     def load(path: Path) -> "KeywordIndex":
-        obj = json.loads(path.read_text(encoding="utf-8"))
+        raw = path.read_bytes()
+        obj = orjson.loads(raw) if orjson is not None else json.loads(raw)
         cfg = KeywordConfig(**obj.get("cfg", {}))
         return KeywordIndex(vocab=obj["vocab"], df=obj["df"], docs=obj["docs"], N=int(obj["N"]), cfg=cfg)
 
+    def save_packed(self, dir_path: Path) -> None:
+        """Persist the index as .npy posting arrays plus pickled metadata.
+
+        Loading this form skips JSON parsing entirely and restores the
+        SoA postings without rebuilding them from the vocab dicts.
+        """
+        if np is None:
+            raise RuntimeError("numpy is required for packed index output. Install with 'uv pip install numpy'.")
+        packed = self.packed()
+        dir_path.mkdir(parents=True, exist_ok=True)
+        np.save(dir_path / "postings_doc_ids.npy", packed.doc_ids)
+        np.save(dir_path / "postings_weights.npy", packed.weights)
+        np.save(dir_path / "restricted.npy", packed.restricted)
+        meta = {
+            "version": 1,
+            "vocab": self.vocab,
+            "df": self.df,
+            "docs": self.docs,
+            "N": self.N,
+            "cfg": self.cfg.as_dict(),
+            "doc_rids": packed.doc_rids,
+            "term_span": packed.term_span,
+        }
+        with (dir_path / "meta.pkl").open("wb") as f:
+            pickle.dump(meta, f, protocol=pickle.HIGHEST_PROTOCOL)
 
-def _add_tokens(weighted_tf: Dict[str, float], text: str, weight: float, stopwords: List[str]) -> None:
+    @staticmethod
+    def load_packed(dir_path: Path) -> "KeywordIndex":
+        with (dir_path / "meta.pkl").open("rb") as f:
+            meta = pickle.load(f)
+        cfg = KeywordConfig(**meta.get("cfg", {}))
+        idx = KeywordIndex(vocab=meta["vocab"], df=meta["df"], docs=meta["docs"], N=int(meta["N"]), cfg=cfg)
+        if np is not None:
+            idx._packed = PackedPostings(
+                doc_rids=meta["doc_rids"],
+                term_span=meta["term_span"],
+                # mmap: pages fault in lazily, so only the postings a
+                # query actually touches are read from disk
+                doc_ids=np.load(dir_path / "postings_doc_ids.npy", mmap_mode="r"),
+                weights=np.load(dir_path / "postings_weights.npy", mmap_mode="r"),
+                restricted=np.load(dir_path / "restricted.npy", mmap_mode="r"),
+            )
+        return idx
+
+
+@functools.lru_cache(maxsize=8)
+def _stop_re(stopwords: Tuple[str, ...]) -> Optional["re.Pattern[str]"]:
+    # Alternation over the stopword set so the C regex engine drops whole
+    # stopwords before tokenization. Deliberately case-sensitive: the
+    # post-split Python check below only sees lowercase pieces, so a
+    # case-insensitive pre-pass would eat acronyms like THE that the old
+    # filter kept.
+    if not stopwords:
+        return None
+    return re.compile(r"\b(?:" + "|".join(map(re.escape, stopwords)) + r")\b")
+
+
+def _add_tokens(weighted_tf: Dict[str, float], text: str, weight: float, stopwords: FrozenSet[str]) -> None:
+    # Callers pass a defaultdict(float): one hash probe per token instead
+    # of the get-then-set pair.
+    sre = _stop_re(tuple(sorted(stopwords)))
+    if sre is not None:
+        text = sre.sub(" ", text)
     for t in _tokenize(text):
+        # Belt-and-braces for stopwords that only appear after camel-splitting
         if t in stopwords:
             continue
-        weighted_tf[t] = weighted_tf.get(t, 0.0) + weight
+        weighted_tf[t] += weight
 
 
-def build_index(snippets: List[Dict], cfg: Optional[KeywordConfig] = None) -> KeywordIndex:
+def _compute_wtf(rec: Dict, cfg: KeywordConfig) -> Dict[str, float]:
+    wtf: Dict[str, float] = defaultdict(float)
+    # name
+    if rec.get("name"):
+        _add_tokens(wtf, rec["name"], cfg.weight_name, cfg.stopwords)
+    # categories
+    for c in (rec.get("categories") or []):
+        _add_tokens(wtf, str(c), cfg.weight_categories, cfg.stopwords)
+    # inputs
+    for inp in (rec.get("inputs") or []):
+        _add_tokens(wtf, str(inp), cfg.weight_inputs, cfg.stopwords)
+    # description
+    if rec.get("description"):
+        _add_tokens(wtf, rec["description"], cfg.weight_description, cfg.stopwords)
+    # code head
+    if rec.get("code"):
+        _add_tokens(wtf, rec["code"][: cfg.code_head_chars], cfg.weight_code_head, cfg.stopwords)
+    return wtf
+
+
+def build_index(
+    snippets: List[Dict],
+    cfg: Optional[KeywordConfig] = None,
+    *,
+    wtf_cache_path: Optional[Path] = None,
+) -> KeywordIndex:
     cfg = cfg or KeywordConfig()
-    vocab: Dict[str, Dict[str, float]] = {}
-    df: Dict[str, int] = {}
+    vocab: Dict[str, Dict[str, float]] = defaultdict(dict)
+    df: Dict[str, int] = defaultdict(int)
     docs: Dict[str, Dict] = {}
 
+    # Optional side-car of per-snippet weighted term frequencies. Snippet
+    # ids hash code+path+lineno, so an id hit means the tokenization is
+    # still valid; a cfg change (weights/stopwords) invalidates the file.
+    cfg_fp = json.dumps(cfg.as_dict(), sort_keys=True)
+    cached_wtf: Dict[str, Dict[str, float]] = {}
+    if wtf_cache_path is not None and wtf_cache_path.exists():
+        try:
+            obj = json.loads(wtf_cache_path.read_text(encoding="utf-8"))
+            if obj.get("cfg") == cfg_fp:
+                cached_wtf = obj.get("wtf") or {}
+        except Exception:
+            cached_wtf = {}
+    fresh = 0
+
     for rec in snippets:
         rid = rec.get("id")
         if not rid:
             continue
-        wtf: Dict[str, float] = {}
-        # name
-        if rec.get("name"):
-            _add_tokens(wtf, rec["name"], cfg.weight_name, cfg.stopwords)
-        # categories
-        for c in (rec.get("categories") or []):
-            _add_tokens(wtf, str(c), cfg.weight_categories, cfg.stopwords)
-        # inputs
-        for inp in (rec.get("inputs") or []):
-            _add_tokens(wtf, str(inp), cfg.weight_inputs, cfg.stopwords)
-        # description
-        if rec.get("description"):
-            _add_tokens(wtf, rec["description"], cfg.weight_description, cfg.stopwords)
-        # code head
-        if rec.get("code"):
-            _add_tokens(wtf, rec["code"][: cfg.code_head_chars], cfg.weight_code_head, cfg.stopwords)
-
-        # Update vocab/df
+        wtf = cached_wtf.get(rid)
+        if wtf is None:
+            wtf = _compute_wtf(rec, cfg)
+            cached_wtf[rid] = wtf
+            fresh += 1
+
+        # Update vocab/df (wtf keys are unique per record, so a token is
+        # new to this doc exactly when rid is not in its bucket yet)
         for tok, tfw in wtf.items():
-            bucket = vocab.setdefault(tok, {})
+            bucket = vocab[tok]
             if rid not in bucket:
-                df[tok] = df.get(tok, 0) + 1
-            bucket[rid] = bucket.get(rid, 0.0) + tfw
+                df[tok] += 1
+                bucket[rid] = tfw
+            else:
+                bucket[rid] += tfw
 
         # Store doc meta
         docs[rid] = {
@@ -131,13 +305,83 @@ def build_index(snippets: List[Dict], cfg: Optional[KeywordConfig] = None) -> Ke
             "description": rec.get("description") or "",
         }
 
-    return KeywordIndex(vocab=vocab, df=df, docs=docs, N=len(docs), cfg=cfg)
+    if wtf_cache_path is not None and fresh:
+        # Prune to the ids of this build so stale snippet versions (ids are
+        # content-derived) do not accumulate across rebuilds
+        try:
+            wtf_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            payload = {"cfg": cfg_fp, "wtf": {rid: cached_wtf[rid] for rid in docs if rid in cached_wtf}}
+            wtf_cache_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        except Exception:
+            pass  # cache is an optimization only; never fail the build
+
+    return KeywordIndex(vocab=dict(vocab), df=dict(df), docs=docs, N=len(docs), cfg=cfg)
 
 
 def _idf(N: int, df: int) -> float:
     return math.log(1.0 + (N / (1.0 + df)))
 
 
+def _search_packed(
+    index: KeywordIndex,
+    packed: PackedPostings,
+    q_unique: List[str],
+    idf_map: Dict[str, float],
+    *,
+    k: int,
+    use_and: bool,
+    exclude_restricted: bool,
+) -> List[Tuple[str, float, Dict]]:
+    N = len(packed.doc_rids)
+    present = [t for t in q_unique if packed.term_span.get(t, (0, 0))[1] > 0]
+    if use_and and len(present) != len(q_unique):
+        return []  # AND with a token that matches nothing
+    if not present:
+        return []
+    n_present = len(present)
+    offsets = np.fromiter((packed.term_span[t][0] for t in present), dtype=np.int64, count=n_present)
+    lengths = np.fromiter((packed.term_span[t][1] for t in present), dtype=np.int64, count=n_present)
+    idfs = np.fromiter((idf_map[t] for t in present), dtype=np.float64, count=n_present)
+    scores = np.zeros(N, dtype=np.float64)
+    if _score_kernel is not None:
+        _score_kernel(packed.doc_ids, packed.weights, offsets, lengths, idfs, scores)
+    else:
+        for qi in range(n_present):
+            o, n = int(offsets[qi]), int(lengths[qi])
+            d = packed.doc_ids[o:o + n]
+            scores += np.bincount(d, weights=packed.weights[o:o + n] * idfs[qi], minlength=N)
+    if use_and:
+        hits = np.zeros(N, dtype=np.int32)
+        for qi in range(n_present):
+            o, n = int(offsets[qi]), int(lengths[qi])
+            hits[packed.doc_ids[o:o + n]] += 1
+    mask = scores > 0.0
+    if use_and:
+        mask &= hits == n_present
+    if exclude_restricted:
+        mask &= ~packed.restricted
+    scores[~mask] = 0.0
+    n_hit = int(mask.sum())
+    if n_hit == 0:
+        return []
+    kk = min(k, n_hit)
+    # O(N) top-k selection. Everything at or above the k-th score is kept,
+    # so candidates tied at the boundary all survive to the sort below —
+    # an argpartition cut of exactly kk would pick an arbitrary subset of
+    # a boundary tie and diverge from the dict path's ordering.
+    if kk < n_hit:
+        kth = -np.partition(-scores, kk - 1)[kk - 1]
+        cand = np.flatnonzero(scores >= kth)
+    else:
+        cand = np.flatnonzero(scores > 0.0)
+    # Materialize only the survivors; same (-score, name) order as the
+    # dict path, then truncate to k
+    top = [(packed.doc_rids[i], float(scores[i])) for i in cand]
+    top.sort(key=lambda kv: (-kv[1], index.docs.get(kv[0], {}).get("name", "")))
+    del top[kk:]
+    return [(rid, sc, index.docs.get(rid) or {}) for rid, sc in top]
+
+
 def _preview(doc: Dict, query_tokens: List[str], code_head: Optional[str] = None) -> str:
     # Prefer description; fallback to name
     text = doc.get("description") or doc.get("name") or ""
@@ -160,10 +404,24 @@ def search(
     q_tokens = [t for t in _tokenize(query) if t and t not in index.cfg.stopwords]
     if not q_tokens:
         return []
+    # Resolve postings and IDF once per unique token (duplicate query
+    # tokens otherwise redo the dict lookups and log() per occurrence)
+    q_unique = list(dict.fromkeys(q_tokens))
+    postings_map = {t: index.vocab.get(t) or {} for t in q_unique}
+    idf_map = {t: _idf(index.N, index.df.get(t, 0)) for t in q_unique}
+    # Packed SoA fast path for larger corpora (category filtering still
+    # takes the dict path, which reads full doc metadata)
+    if np is not None and index.N >= _PACKED_MIN_DOCS and category is None:
+        packed = index.packed()
+        if packed is not None:
+            return _search_packed(
+                index, packed, q_unique, idf_map,
+                k=k, use_and=use_and, exclude_restricted=exclude_restricted,
+            )
     # Candidate doc ids (OR/AND)
     candidate_ids: Optional[set] = None
-    for t in q_tokens:
-        ids = set(index.vocab.get(t, {}).keys())
+    for t in q_unique:
+        ids = set(postings_map[t].keys())
         if candidate_ids is None:
             candidate_ids = ids
         else:
@@ -180,11 +438,11 @@ def search(
 
     # Score
     scores: Dict[str, float] = {}
-    for t in q_tokens:
-        postings = index.vocab.get(t)
+    for t in q_unique:
+        postings = postings_map[t]
         if not postings:
             continue
-        idf = _idf(index.N, index.df.get(t, 0))
+        idf = idf_map[t]
         for rid, tfw in postings.items():
             if rid not in candidate_ids:
                 continue
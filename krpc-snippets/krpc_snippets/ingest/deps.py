@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import ast
+import hashlib
+import os
+import pickle
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 
-from .python_ast import parse_python_module
+from .python_ast import ModuleSummary, parse_python_module
 from .walk_repo import WalkOptions, discover_python_files
 
 
@@ -26,13 +29,16 @@ class Symbol:
     path: str   # repo-relative path (POSIX)
 
 
-def build_symbol_index(repo_root: Path) -> Dict[str, Symbol]:
+def build_symbol_index(repo_root: Path, *, modules: Optional[List[Tuple[str, ModuleSummary]]] = None) -> Dict[str, Symbol]:
     repo_root = repo_root.resolve()
     idx: Dict[str, Symbol] = {}
-    for fi in discover_python_files(repo_root, WalkOptions()):
-        rel = fi.rel_path
+    if modules is None:
+        modules = [
+            (fi.rel_path, parse_python_module(Path(fi.abs_path)))
+            for fi in discover_python_files(repo_root, WalkOptions())
+        ]
+    for rel, summ in modules:
         modname = modulize_rel_path(rel)
-        summ = parse_python_module(Path(fi.abs_path))
         if summ.parse_error:
             continue
         for fn in summ.functions:
@@ -47,127 +53,219 @@ def build_symbol_index(repo_root: Path) -> Dict[str, Symbol]:
     return idx
 
 
-def _alias_map(mod: ast.Module) -> Dict[str, str]:
-    amap: Dict[str, str] = {}
-    for node in mod.body:
-        if isinstance(node, ast.Import):
+def _dotted_from_attr(node: ast.AST) -> Optional[str]:
+    # Attribute chains are short, so building the dotted string directly
+    # beats a list + reverse + join per call expression.
+    cur = node
+    dotted = ""
+    while isinstance(cur, ast.Attribute):
+        dotted = cur.attr if not dotted else cur.attr + "." + dotted
+        cur = cur.value
+    if isinstance(cur, ast.Name):
+        return cur.id + "." + dotted if dotted else cur.id
+    return None
+
+
+class _ModuleCallVisitor(ast.NodeVisitor):
+    """Single-pass visitor collecting import aliases, class methods and
+    call edges; replaces the old alias pre-pass plus per-function walks.
+
+    Aliases are recorded in document order, so the usual imports-at-top
+    layout resolves exactly as before.
+    """
+
+    def __init__(self) -> None:
+        self.amap: Dict[str, str] = {}
+        self.calls: Dict[str, Set[str]] = {}
+        self.class_methods: Dict[str, Set[str]] = {}
+        self._cls: List[str] = []  # class stack (supports nested classes)
+        self._qn: Optional[str] = None  # enclosing top-level function/method
+
+    def visit_Import(self, node: ast.Import) -> None:
+        if self._qn is None and not self._cls:  # top-level imports only, as before
             for a in node.names:
                 if a.asname:
-                    amap[a.asname] = a.name
+                    self.amap[a.asname] = a.name
                 else:
                     root = a.name.split(".")[0]
-                    amap[root] = root
+                    self.amap[root] = root
                     # also map full dotted name to itself for convenience
-                    amap[a.name] = a.name
-        elif isinstance(node, ast.ImportFrom):
+                    self.amap[a.name] = a.name
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if self._qn is None and not self._cls:
             base = node.module or ""
             for a in node.names:
                 tgt = f"{base}.{a.name}" if base else a.name
-                alias = a.asname or a.name
-                amap[alias] = tgt
-    return amap
+                self.amap[a.asname or a.name] = tgt
 
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        if self._qn is None and not self._cls:
+            self.class_methods[node.name] = {
+                ch.name for ch in node.body if isinstance(ch, (ast.FunctionDef, ast.AsyncFunctionDef))
+            }
+        self._cls.append(node.name)
+        self.generic_visit(node)
+        self._cls.pop()
 
-def _dotted_from_attr(node: ast.AST) -> Optional[str]:
-    parts: List[str] = []
-    cur = node
-    while isinstance(cur, ast.Attribute):
-        parts.append(cur.attr)
-        cur = cur.value
-    if isinstance(cur, ast.Name):
-        parts.append(cur.id)
-        parts.reverse()
-        return ".".join(parts)
-    return None
-
+    def _visit_fn(self, node) -> None:
+        if self._qn is None:
+            self._qn = f"{self._cls[-1]}.{node.name}" if self._cls else node.name
+            self.generic_visit(node)
+            self._qn = None
+        else:
+            # Nested function: attribute its calls to the enclosing qualname
+            self.generic_visit(node)
 
-def analyze_module_calls(path: Path) -> Tuple[str, Dict[str, Set[str]], Dict[str, Set[str]]]:
-    """Return (module_name, calls_map, class_to_methods) for a module.
+    visit_FunctionDef = _visit_fn
+    visit_AsyncFunctionDef = _visit_fn
 
-    calls_map: qualname -> set of dotted candidate symbols (unresolved to repo-local yet)
-    class_to_methods: class_name -> set of method names
-    """
-    text = Path(path).read_text(encoding="utf-8")
-    mod = ast.parse(text)
-    amap = _alias_map(mod)
-    module_name = modulize_rel_path(str(Path(path)))  # absolute path, will be reduced later
-    # Correct module_name to repo-relative by stripping repo root later
-    calls: Dict[str, Set[str]] = {}
-    class_methods: Dict[str, Set[str]] = {}
-
-    # Build class methods registry
-    for node in mod.body:
-        if isinstance(node, ast.ClassDef):
-            mset: Set[str] = set()
-            for ch in node.body:
-                if isinstance(ch, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                    mset.add(ch.name)
-            class_methods[node.name] = mset
-
-    def add_call(qn: str, sym: str) -> None:
-        calls.setdefault(qn, set()).add(sym)
-
-    class FnVisitor(ast.NodeVisitor):
-        def __init__(self, qn: str, cls: Optional[str] = None) -> None:
-            self.qn = qn
-            self.cls = cls
-
-        def visit_Call(self, node: ast.Call) -> None:
+    def visit_Call(self, node: ast.Call) -> None:
+        if self._qn is not None:
             target = node.func
             dotted: Optional[str] = None
             if isinstance(target, ast.Name):
                 nm = target.id
-                if nm in amap:
-                    dotted = amap[nm]
-                else:
-                    # Local function name
-                    dotted = nm
+                dotted = self.amap.get(nm, nm)  # alias target or local name
             elif isinstance(target, ast.Attribute):
                 d = _dotted_from_attr(target)
                 if d:
                     dotted = d
                     # Resolve root alias if any
                     root = d.split(".")[0]
-                    if root in amap:
-                        dotted = amap[root] + "." + ".".join(d.split(".")[1:])
-                    elif root == "self" and self.cls:
-                        dotted = f"{self.cls}." + ".".join(d.split(".")[1:])
+                    if root in self.amap:
+                        dotted = self.amap[root] + "." + ".".join(d.split(".")[1:])
+                    elif root == "self" and self._cls:
+                        dotted = f"{self._cls[-1]}." + ".".join(d.split(".")[1:])
                 # else leave None
             if dotted:
-                add_call(self.qn, dotted)
-            self.generic_visit(node)
+                self.calls.setdefault(self._qn, set()).add(dotted)
+        self.generic_visit(node)
+
+
+def analyze_module_tree(mod: ast.Module) -> Tuple[Dict[str, Set[str]], Dict[str, Set[str]]]:
+    """Return (calls_map, class_to_methods) from an already-parsed AST.
+
+    Lets callers that have parsed the module once (ingest) share the tree
+    with dependency resolution instead of re-reading the file.
+    """
+    visitor = _ModuleCallVisitor()
+    visitor.visit(mod)
+    return visitor.calls, visitor.class_methods
+
 
-    for node in mod.body:
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            qn = node.name
-            FnVisitor(qn).visit(node)
-        elif isinstance(node, ast.ClassDef):
-            for ch in node.body:
-                if isinstance(ch, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                    qn = f"{node.name}.{ch.name}"
-                    FnVisitor(qn, cls=node.name).visit(ch)
+def analyze_module_calls(path: str | Path) -> Tuple[str, Dict[str, Set[str]], Dict[str, Set[str]]]:
+    """Return (module_name, calls_map, class_to_methods) for a module.
 
+    calls_map: qualname -> set of dotted candidate symbols (unresolved to repo-local yet)
+    class_to_methods: class_name -> set of method names
+    """
+    # Plain str paths throughout the per-file hot path; Path wrapping and
+    # os.fspath conversions add up over thousands of modules.
+    spath = os.fspath(path)
+    # ast.parse accepts raw bytes and does its own PEP 263-aware decode,
+    # so skip materializing an intermediate str of the whole source.
+    with open(spath, "rb") as f:
+        data = f.read()
+    mod = ast.parse(data, filename=spath)
+    module_name = modulize_rel_path(spath)  # absolute path, will be reduced later
+    # Correct module_name to repo-relative by stripping repo root later
+    calls, class_methods = analyze_module_tree(mod)
     return module_name, calls, class_methods
 
 
+# Bump to invalidate cached analyses when the result schema changes
+_DEPS_CACHE_VERSION = "v1"
+_DEFAULT_DEPS_CACHE = Path("krpc-snippets/data/deps_cache")
+
+# Worker-pool startup only pays off once there is enough parsing to share
+_PARALLEL_MIN_FILES = 32
+
+
+def _analyze_or_none(path: str | Path) -> Optional[Tuple[str, Dict[str, Set[str]], Dict[str, Set[str]]]]:
+    # Module-level so ProcessPoolExecutor can pickle it
+    try:
+        return analyze_module_calls_cached(path)
+    except Exception:
+        return None
+
+
+def analyze_module_calls_cached(path: str | Path, cache_dir: Optional[Path] = _DEFAULT_DEPS_CACHE) -> Tuple[str, Dict[str, Set[str]], Dict[str, Set[str]]]:
+    """analyze_module_calls with an on-disk cache keyed by (path, mtime, size).
+
+    Unchanged files skip parsing entirely on re-ingest; pass
+    ``cache_dir=None`` to force a fresh analysis.
+    """
+    if cache_dir is None:
+        return analyze_module_calls(path)
+    cache_file: Optional[Path] = None
+    try:
+        p = os.path.abspath(os.fspath(path))
+        st = os.stat(p)
+        key = hashlib.blake2b(
+            f"{_DEPS_CACHE_VERSION}|{p}|{st.st_mtime_ns}|{st.st_size}".encode(), digest_size=16
+        ).hexdigest()
+        cache_file = cache_dir / f"{key}.pkl"
+        if cache_file.exists():
+            with cache_file.open("rb") as f:
+                return pickle.load(f)
+    except Exception:
+        cache_file = None
+    result = analyze_module_calls(path)
+    if cache_file is not None:
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            cache_file.write_bytes(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            pass
+    return result
+
+
 def resolve_dependencies(
     repo_root: Path,
     *,
     symbol_index: Dict[str, Symbol],
+    cache_dir: Optional[Path] = _DEFAULT_DEPS_CACHE,
+    modules: Optional[List[Tuple[str, ModuleSummary]]] = None,
 ) -> Dict[Tuple[str, str], Set[str]]:
     """Return mapping {(rel_path, qualname)} -> set of resolved repo-local symbols (module.qualname).
+
+    ``modules`` takes pre-parsed (rel_path, ModuleSummary) pairs from the
+    ingest pass so each file is read and parsed only once per pipeline run.
     """
     repo_root = repo_root.resolve()
     dep_map: Dict[Tuple[str, str], Set[str]] = {}
-    files = discover_python_files(repo_root, WalkOptions())
-    for fi in files:
-        abs_p = Path(fi.abs_path)
-        rel = fi.rel_path
+    if modules is not None:
+        rels = [rel for rel, _ in modules]
+        analyses = [
+            (None, *analyze_module_tree(summ.tree)) if summ.tree is not None else None
+            for _, summ in modules
+        ]
+    else:
+        files = discover_python_files(repo_root, WalkOptions())
+        rels = [fi.rel_path for fi in files]
+        # AST parsing is CPU-bound; fan the per-file analysis out to worker
+        # processes for larger repos and keep symbol resolution in-process.
+        analyses = None
+        if cache_dir == _DEFAULT_DEPS_CACHE and len(files) >= _PARALLEL_MIN_FILES:
+            try:
+                from concurrent.futures import ProcessPoolExecutor
+                with ProcessPoolExecutor() as ex:
+                    analyses = list(ex.map(_analyze_or_none, [fi.abs_path for fi in files], chunksize=16))
+            except Exception:
+                analyses = None  # pool unavailable; fall back to serial
+        if analyses is None:
+            analyses = [None] * len(files)
+            for i, fi in enumerate(files):
+                try:
+                    analyses[i] = analyze_module_calls_cached(fi.abs_path, cache_dir)
+                except Exception:
+                    pass
+    for rel, analysis in zip(rels, analyses):
         modname = modulize_rel_path(rel)
-        try:
-            _, calls_map, class_methods = analyze_module_calls(abs_p)
-        except Exception:
+        if analysis is None:
             continue
+        _, calls_map, class_methods = analysis
         # Post-process calls_map to fully qualified names and keep only repo-local
         for qn, cset in calls_map.items():
             resolved: Set[str] = set()
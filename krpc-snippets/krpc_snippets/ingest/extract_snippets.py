@@ -35,13 +35,11 @@ class ExtractOptions:
     default_license_url: str = "about:blank"
 
 
-def _hash_str(s: str) -> str:
-    return hashlib.sha256(s.encode("utf-8")).hexdigest()
-
-
 def stable_id(repo: str, commit: str, rel_path: str, kind: str, qualname: str, lineno: int, end_lineno: int) -> str:
-    key = "|".join([repo, commit, rel_path, kind, qualname, str(lineno), str(end_lineno)])
-    return _hash_str(key)
+    # Single f-string + one sha256 call; the key layout must not change or
+    # every previously-issued id would be invalidated.
+    key = f"{repo}|{commit}|{rel_path}|{kind}|{qualname}|{lineno}|{end_lineno}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
 
 
 def _param_names(params: List[str]) -> List[str]:
@@ -239,6 +237,24 @@ def extract_from_file(
     return extract_from_module(prov, mod, opts)
 
 
+def parse_repo(
+    repo_root: Path,
+    *,
+    walk_opts: Optional[WalkOptions] = None,
+) -> List[Tuple[str, ModuleSummary]]:
+    """Parse every discovered module once, returning (rel_path, summary) pairs.
+
+    The summaries keep their parsed ASTs, so extraction, symbol indexing and
+    dependency resolution can all share a single read+parse per file.
+    """
+    walk_opts = walk_opts or WalkOptions()
+    repo_root = repo_root.resolve()
+    return [
+        (fi.rel_path, parse_python_module(Path(fi.abs_path)))
+        for fi in discover_python_files(repo_root, walk_opts)
+    ]
+
+
 def extract_from_repo(
     repo_root: Path,
     *,
@@ -246,19 +262,26 @@ def extract_from_repo(
     commit: Optional[str] = None,
     opts: Optional[ExtractOptions] = None,
     walk_opts: Optional[WalkOptions] = None,
+    modules: Optional[List[Tuple[str, ModuleSummary]]] = None,
 ) -> List[Dict[str, Any]]:
-    walk_opts = walk_opts or WalkOptions()
-    files = discover_python_files(repo_root, walk_opts)
+    opts = opts or ExtractOptions()
+    repo_root = repo_root.resolve()
+    if modules is None:
+        modules = parse_repo(repo_root, walk_opts=walk_opts)
+
+    # Determine provenance once for the whole repo
+    if not (repo_url and commit):
+        det = detect_provenance(repo_root)
+        if det:
+            repo_url, commit = det
+    if not (repo_url and commit):
+        raise ValueError("Provenance missing: provide --repo-url and --commit or include fetch.json at repo root")
+
     out: List[Dict[str, Any]] = []
-    for fi in files:
-        out.extend(
-            extract_from_file(
-                repo_root,
-                Path(fi.abs_path),
-                repo_url=repo_url,
-                commit=commit,
-                opts=opts,
-            )
-        )
+    for rel, mod in modules:
+        if mod.parse_error:
+            continue
+        prov = Provenance(repo_url=repo_url, commit=commit, repo_root=repo_root, rel_path=rel)
+        out.extend(extract_from_module(prov, mod, opts))
     return out
 
@@ -9,6 +9,11 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional, Dict, Any
 
+try:
+    import pygit2  # type: ignore
+except Exception:
+    pygit2 = None  # optional; git operations fall back to subprocess
+
 
 @dataclass
 class FetchResult:
@@ -56,18 +61,45 @@ def is_git_repo(path: Path) -> bool:
     return (path / ".git").exists()
 
 
+def _pygit2_repo(path: Path):
+    # In-process libgit2 handle, or None when pygit2 is unavailable; callers
+    # fall back to shelling out to git.
+    if pygit2 is None:
+        return None
+    try:
+        return pygit2.Repository(str(path))
+    except Exception:
+        return None
+
+
 def clone_or_update(url_or_path: str, dest_root: Path, *, shallow_depth: int = 1) -> Path:
     dest_root.mkdir(parents=True, exist_ok=True)
     dest = dest_root / slugify_repo(url_or_path)
     if not is_git_repo(dest):
-        # Clone
-        cmd = ["git", "clone"]
-        if shallow_depth and shallow_depth > 0:
-            cmd += ["--depth", str(shallow_depth)]
-        cmd += [url_or_path, str(dest)]
-        _run(cmd)
+        # Clone; in-process via libgit2 when available, else the git CLI
+        cloned = False
+        if pygit2 is not None:
+            try:
+                pygit2.clone_repository(url_or_path, str(dest), depth=max(0, shallow_depth))
+                cloned = True
+            except Exception:
+                cloned = False  # e.g. older pygit2 without depth support
+        if not cloned:
+            cmd = ["git", "clone"]
+            if shallow_depth and shallow_depth > 0:
+                cmd += ["--depth", str(shallow_depth)]
+            cmd += [url_or_path, str(dest)]
+            _run(cmd)
     else:
         # Fetch updates best-effort
+        repo = _pygit2_repo(dest)
+        if repo is not None:
+            try:
+                for remote in repo.remotes:
+                    remote.fetch(prune=pygit2.GIT_FETCH_PRUNE)
+                return dest
+            except Exception:
+                pass
         try:
             _run(["git", "fetch", "--all", "--prune"], cwd=dest)
         except Exception:
@@ -76,12 +108,27 @@ def clone_or_update(url_or_path: str, dest_root: Path, *, shallow_depth: int = 1
 
 
 def get_current_commit(repo_path: Path) -> str:
+    repo = _pygit2_repo(repo_path)
+    if repo is not None:
+        try:
+            return str(repo.head.target)
+        except Exception:
+            pass
     proc = _run(["git", "rev-parse", "HEAD"], cwd=repo_path)
     return proc.stdout.strip()
 
 
 def get_default_branch(repo_path: Path) -> Optional[str]:
     # Try to resolve origin/HEAD -> origin/<branch>
+    repo = _pygit2_repo(repo_path)
+    if repo is not None:
+        try:
+            ref = repo.lookup_reference("refs/remotes/origin/HEAD").target
+            prefix = "refs/remotes/origin/"
+            if isinstance(ref, str) and ref.startswith(prefix):
+                return ref[len(prefix):]
+        except Exception:
+            pass
     try:
         proc = _run(["git", "symbolic-ref", "--quiet", "--short", "refs/remotes/origin/HEAD"], cwd=repo_path, check=False)
         ref = proc.stdout.strip()
@@ -94,6 +141,17 @@ def get_default_branch(repo_path: Path) -> Optional[str]:
 
 def checkout(repo_path: Path, *, branch: Optional[str] = None, sha: Optional[str] = None, shallow_depth: int = 1) -> str:
     if sha:
+        # Fast path: commit already local -> detached checkout via libgit2,
+        # no fork/exec at all
+        repo = _pygit2_repo(repo_path)
+        if repo is not None:
+            try:
+                commit = repo.revparse_single(f"{sha}^{{commit}}")
+                repo.checkout_tree(commit, strategy=pygit2.GIT_CHECKOUT_FORCE)
+                repo.set_head(commit.id)
+                return str(commit.id)
+            except Exception:
+                pass  # missing commit or checkout conflict: use git CLI below
         # Ensure commit exists locally
         fetched = False
         try:
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import functools
 import json
+import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Optional, Tuple, List
 
-from .python_ast import parse_python_module
+from .python_ast import ModuleSummary, parse_python_module
 from .extract_snippets import stable_id
 
 
@@ -67,6 +69,22 @@ def fill_provenance(record: Dict, repo_root: Path, repo_url: Optional[str], comm
     return out
 
 
+@functools.lru_cache(maxsize=None)
+def _parse_cached(path_str: str, mtime_ns: int, size: int) -> ModuleSummary:
+    # mtime+size key the cache, so an edited file re-parses while an audit
+    # over many records per module parses each module only once. Audits
+    # only need line spans, so skip code_span materialization.
+    return parse_python_module(Path(path_str), with_code_spans=False)
+
+
+def _parse_module_cached(fp: Path) -> ModuleSummary:
+    try:
+        st = os.stat(fp)
+    except OSError:
+        return parse_python_module(fp)  # surfaces the error as parse_error
+    return _parse_cached(str(fp), st.st_mtime_ns, st.st_size)
+
+
 def _find_node_span_for_record(repo_root: Path, record: Dict) -> Optional[Tuple[str, str, int, int]]:
     """Return (kind, qualname, lineno, end_lineno) for a record by parsing the module and matching name/kind.
 
@@ -74,26 +92,26 @@ def _find_node_span_for_record(repo_root: Path, record: Dict) -> Optional[Tuple[
     For const block, uses the first const block.
     """
     rel = record.get("path")
-    kind = (record.get("categories") or ["function"])[0]
+    cats = record.get("categories")
+    kind = cats[0] if cats else "function"
     name = record.get("name")
     fp = (repo_root / rel).resolve()
-    mod = parse_python_module(fp)
+    mod = _parse_module_cached(fp)
     if mod.parse_error:
         return None
     if kind == "function":
-        for fn in mod.functions:
-            if fn.qualname == name:
-                return (kind, fn.qualname, fn.lineno, fn.end_lineno)
+        fn = mod.functions_by_qualname().get(name)
+        if fn is not None:
+            return (kind, fn.qualname, fn.lineno, fn.end_lineno)
     elif kind == "method":
         # Methods are stored under classes in summary
-        for cls in mod.classes:
-            for m in cls.methods:
-                if m.qualname == name:
-                    return (kind, m.qualname, m.lineno, m.end_lineno)
+        m = mod.methods_by_qualname().get(name)
+        if m is not None:
+            return (kind, m.qualname, m.lineno, m.end_lineno)
     elif kind == "class":
-        for cls in mod.classes:
-            if cls.qualname == name:
-                return (kind, cls.qualname, cls.lineno, cls.end_lineno)
+        cls = mod.classes_by_qualname().get(name)
+        if cls is not None:
+            return (kind, cls.qualname, cls.lineno, cls.end_lineno)
     elif kind == "const":
         cb = (mod.const_blocks[0] if mod.const_blocks else None)
         if cb is not None:
@@ -101,28 +119,41 @@ def _find_node_span_for_record(repo_root: Path, record: Dict) -> Optional[Tuple[
     return None
 
 
-def recompute_id(record: Dict, repo_root: Path) -> Optional[str]:
-    repo = record.get("repo")
-    commit = record.get("commit")
+def recompute_id(record: Dict, repo_root: Path, *, repo: Optional[str] = None, commit: Optional[str] = None) -> Optional[str]:
+    # Batch callers pass repo/commit pre-stringified once for the whole run
+    repo = repo if repo is not None else record.get("repo")
+    commit = commit if commit is not None else record.get("commit")
     rel = record.get("path")
     if not (repo and commit and rel):
         return None
+    repo, commit, rel = str(repo), str(commit), str(rel)
+    # Records that already carry their span (enriched exports) don't need a
+    # reparse; the id is a pure function of fields we have in hand
+    lineno = record.get("lineno")
+    end_lineno = record.get("end_lineno")
+    name = record.get("name")
+    if lineno and end_lineno and name:
+        cats = record.get("categories")
+        kind = cats[0] if cats else "function"
+        qualname = "CONST_BLOCK" if kind == "const" else str(name)
+        return stable_id(repo, commit, rel, kind, qualname, int(lineno), int(end_lineno))
     span = _find_node_span_for_record(repo_root, record)
     if not span:
         return None
     kind, qualname, lineno, end_lineno = span
-    return stable_id(str(repo), str(commit), str(rel), kind, qualname, lineno, end_lineno)
+    return stable_id(repo, commit, rel, kind, qualname, lineno, end_lineno)
 
 
-def audit_record(record: Dict, repo_root: Path, repo_url: Optional[str], commit: Optional[str]) -> AuditReport:
+def _audit_one(record: Dict, root: Path) -> AuditReport:
+    # root must already be resolved; the path check inlines normalize_path
+    # so the repo root is not re-resolved per record
     missing_prov = not bool(record.get("repo")) or not bool(record.get("commit"))
-    # Path validity
     try:
-        normalize_path(repo_root, record.get("path", ""))
+        (root / record.get("path", "")).resolve().relative_to(root)
         bad_path = False
     except Exception:
         bad_path = True
-    new_id = recompute_id(record, repo_root)
+    new_id = recompute_id(record, root)
     id_mismatch = False
     span_unresolved = False
     if new_id is None:
@@ -138,6 +169,18 @@ def audit_record(record: Dict, repo_root: Path, repo_url: Optional[str], commit:
     )
 
 
+def audit_record(record: Dict, repo_root: Path, repo_url: Optional[str], commit: Optional[str]) -> AuditReport:
+    return _audit_one(record, repo_root.resolve())
+
+
+def audit_many(records: List[Dict], repo_root: Path, repo_url: Optional[str] = None, commit: Optional[str] = None) -> List[AuditReport]:
+    """Audit a batch of records with the per-run setup done once: the repo
+    root is resolved a single time and module parses are shared through the
+    parse cache across all records of the same file."""
+    root = repo_root.resolve()
+    return [_audit_one(r, root) for r in records]
+
+
 def fix_record(record: Dict, repo_root: Path, repo_url: Optional[str], commit: Optional[str], *, repair_id: bool = False) -> Dict:
     out = fill_provenance(record, repo_root, repo_url, commit)
     if repair_id:
@@ -5,7 +5,7 @@ import io
 import tokenize
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 
 @dataclass
@@ -58,6 +58,32 @@ class ModuleSummary:
     classes: List[AstClass]
     const_blocks: List[ConstBlock]
     parse_error: Optional[str] = None
+    # Parsed AST kept so downstream passes (dependency analysis) can reuse
+    # it instead of re-reading and re-parsing the file.
+    tree: Optional[ast.Module] = field(default=None, repr=False)
+
+    def functions_by_qualname(self) -> Dict[str, AstFunction]:
+        """Lazily-built qualname lookup; audit-style callers resolve many
+        records against the same summary, so avoid a linear scan each time."""
+        cached = getattr(self, "_fn_index", None)
+        if cached is None:
+            cached = {fn.qualname: fn for fn in self.functions}
+            self._fn_index = cached
+        return cached
+
+    def classes_by_qualname(self) -> Dict[str, AstClass]:
+        cached = getattr(self, "_cls_index", None)
+        if cached is None:
+            cached = {cls.qualname: cls for cls in self.classes}
+            self._cls_index = cached
+        return cached
+
+    def methods_by_qualname(self) -> Dict[str, AstFunction]:
+        cached = getattr(self, "_meth_index", None)
+        if cached is None:
+            cached = {m.qualname: m for cls in self.classes for m in cls.methods}
+            self._meth_index = cached
+        return cached
 
 
 def _node_span(node: ast.AST) -> Tuple[int, int]:
@@ -90,15 +116,22 @@ def _leading_comments_above(lines: List[str], start_line: int) -> Optional[str]:
     collected: List[str] = []
     blanks = 0
     while i >= 0:
-        s = lines[i].rstrip("\n")
-        if s.strip().startswith("#"):
-            collected.append(s)
+        # Called for every def/class: classify the line by its first
+        # non-blank character instead of allocating strip()ed copies
+        line = lines[i]
+        j = 0
+        n = len(line)
+        while j < n and line[j] in " \t":
+            j += 1
+        ch = line[j] if j < n else ""
+        if ch == "#":
+            collected.append(line.rstrip("\n"))
             i -= 1
             continue
-        if s.strip() == "":
+        if ch in ("", "\n", "\r"):
             blanks += 1
             if blanks <= 1:
-                collected.append(s)
+                collected.append(line.rstrip("\n"))
                 i -= 1
                 continue
         break
@@ -114,6 +147,21 @@ def _leading_comments_above(lines: List[str], start_line: int) -> Optional[str]:
 
 
 def _unparse(node: ast.AST) -> Optional[str]:
+    # Most annotations, decorators and bases are bare or dotted names;
+    # render those directly instead of spinning up the full ast.unparse
+    # visitor per node (it dominates summarization on annotation-heavy
+    # modules). Output is identical to ast.unparse for these shapes.
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        parts = [node.attr]
+        cur = node.value
+        while isinstance(cur, ast.Attribute):
+            parts.append(cur.attr)
+            cur = cur.value
+        if isinstance(cur, ast.Name):
+            parts.append(cur.id)
+            return ".".join(reversed(parts))
     try:
         return ast.unparse(node)  # type: ignore[attr-defined]
     except Exception:
@@ -177,7 +225,7 @@ def _collect_imports(mod: ast.Module) -> Tuple[List[str], List[str]]:
     return dedup(imps), dedup(frs)
 
 
-def _detect_const_blocks(mod: ast.Module, lines: List[str]) -> List[ConstBlock]:
+def _detect_const_blocks(mod: ast.Module, lines: List[str], *, with_code_spans: bool = True) -> List[ConstBlock]:
     blocks: List[ConstBlock] = []
     cur_names: List[str] = []
     start: Optional[int] = None
@@ -217,17 +265,22 @@ def _detect_const_blocks(mod: ast.Module, lines: List[str]) -> List[ConstBlock]:
             break
 
     if start is not None and end is not None and cur_names:
-        code = _slice_code(lines, start, end)
+        code = _slice_code(lines, start, end) if with_code_spans else None
         blocks.append(ConstBlock(lineno=start, end_lineno=end, assignments=cur_names, code_span=code))
     return blocks
 
 
-def parse_python_module(path: Path) -> ModuleSummary:
-    # Use tokenize.open to respect PEP 263 encoding cookie
+def parse_python_module(path: Path, *, with_code_spans: bool = True) -> ModuleSummary:
+    # Read the raw bytes once; detect the PEP 263 encoding cookie from the
+    # buffer and hand the bytes straight to ast.parse, which does its own
+    # cookie-aware decode. One read + one decode for the slicing text.
     try:
-        with tokenize.open(str(path)) as f:
-            text = f.read()
-            encoding = f.encoding or "utf-8"
+        with open(path, "rb") as f:
+            data = f.read()
+        encoding = tokenize.detect_encoding(io.BytesIO(data).readline)[0] or "utf-8"
+        # TextIOWrapper keeps universal-newline translation identical to the
+        # previous tokenize.open behaviour for CRLF sources
+        text = io.TextIOWrapper(io.BytesIO(data), encoding=encoding).read()
     except Exception as e:
         return ModuleSummary(
             path=str(path),
@@ -243,7 +296,7 @@ def parse_python_module(path: Path) -> ModuleSummary:
 
     lines = text.splitlines(True)
     try:
-        mod = ast.parse(text)
+        mod = ast.parse(data, filename=str(path))
     except SyntaxError as e:
         return ModuleSummary(
             path=str(path),
@@ -284,7 +337,7 @@ def parse_python_module(path: Path) -> ModuleSummary:
                 returns=ret,
                 docstring=doc,
                 leading_comments=leading,
-                code_span=_slice_code(lines, lineno, end_lineno),
+                code_span=_slice_code(lines, lineno, end_lineno) if with_code_spans else None,
             )
             functions.append(fn)
         elif isinstance(node, ast.ClassDef):
@@ -304,7 +357,7 @@ def parse_python_module(path: Path) -> ModuleSummary:
                 decorators=decos,
                 docstring=doc,
                 leading_comments=leading,
-                code_span=_slice_code(lines, lineno, end_lineno),
+                code_span=_slice_code(lines, lineno, end_lineno) if with_code_spans else None,
             )
             # Methods
             for child in node.body:
@@ -329,12 +382,12 @@ def parse_python_module(path: Path) -> ModuleSummary:
                         leading_comments=leading2,
                         is_method=True,
                         parent_class=node.name,
-                        code_span=_slice_code(lines, l2, e2),
+                        code_span=_slice_code(lines, l2, e2) if with_code_spans else None,
                     )
                     cls.methods.append(fn2)
             classes.append(cls)
 
-    const_blocks = _detect_const_blocks(mod, lines)
+    const_blocks = _detect_const_blocks(mod, lines, with_code_spans=with_code_spans)
 
     return ModuleSummary(
         path=str(path),
@@ -345,5 +398,6 @@ def parse_python_module(path: Path) -> ModuleSummary:
         functions=functions,
         classes=classes,
         const_blocks=const_blocks,
+        tree=mod,
     )
 
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 import fnmatch
+import functools
 import hashlib
 import json
 import os
+import re
 import shlex
 import subprocess
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 
 REPO_IGNORE_FILE = ".krpc-snippets-ignore"
@@ -21,7 +23,7 @@ class FileInfo:
     abs_path: str
     lang: str
     size_bytes: int
-    sha256: str
+    sha256: Optional[str]
 
 
 @dataclass
@@ -31,6 +33,9 @@ class WalkOptions:
     exclude_globs: List[str] = field(default_factory=list)
     max_size_bytes: Optional[int] = None
     use_git_ls_files: bool = True
+    # Hashing dominates cold discovery; callers that only need paths and
+    # spans (AST parsing, provenance filling) can turn it off
+    compute_sha256: bool = True
 
 
 def default_exclude_dirs() -> List[str]:
@@ -60,49 +65,91 @@ def _read_repo_ignores(repo_root: Path) -> List[str]:
 
 def _git_ls_files(repo_root: Path) -> List[str]:
     proc = subprocess.run(
-        ["git", "-C", str(repo_root), "ls-files", "-z"],
+        ["git", "-C", str(repo_root), "ls-files", "-z",
+         "--cached", "--others", "--exclude-standard"],
         text=False,
         capture_output=True,
     )
     if proc.returncode != 0:
         return []
     raw = proc.stdout or b""
-    # NUL separated
-    items = [s.decode("utf-8", errors="ignore") for s in raw.split(b"\x00") if s]
-    return [x for x in items if x]
+    # NUL separated; one batch decode instead of a str object per entry
+    return [x for x in raw.decode("utf-8", errors="ignore").split("\x00") if x]
 
 
-def _match_any(path: str, patterns: Iterable[str]) -> bool:
+@functools.lru_cache(maxsize=32)
+def _compile_matcher(patterns: Tuple[str, ...]) -> Optional[Tuple["re.Pattern[str]", Tuple[str, ...]]]:
+    """Compile a pattern list once: a combined glob alternation plus the
+    literal directory bases for '**'-style patterns.
+
+    The walker tests every file against the same few pattern lists, so one
+    regex dispatch replaces a Python fnmatch loop per file.
+    """
+    if not patterns:
+        return None
+    combined = re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in patterns))
+    dir_bases: List[str] = []
     for pat in patterns:
-        # Interpret patterns as glob, applied on POSIX-style rel_path
-        if fnmatch.fnmatch(path, pat):
-            return True
-        # Additional support for directory-wide patterns like '**/pkg/**' or 'pkg/**'
         if "/**" in pat:
             base = pat.split("/**", 1)[0]
             # strip leading '**/' if present
             while base.startswith("**/"):
                 base = base[3:]
-            if not base:
-                continue
-            if path == base or path.startswith(base + "/") or ("/" + base + "/") in ("/" + path + "/"):
+            if base:
+                dir_bases.append("/" + base + "/")
+    return combined, tuple(dir_bases)
+
+
+def _match_any(path: str, patterns: Iterable[str]) -> bool:
+    # Interpret patterns as glob, applied on POSIX-style rel_path, with
+    # directory-wide support for patterns like '**/pkg/**' or 'pkg/**'
+    compiled = _compile_matcher(tuple(patterns))
+    if compiled is None:
+        return False
+    combined, dir_bases = compiled
+    if combined.match(path) is not None:
+        return True
+    if dir_bases:
+        wrapped = "/" + path + "/"
+        for base in dir_bases:
+            if base in wrapped:
                 return True
     return False
 
 
+# Thread startup only pays off once there are enough files to hash
+_HASH_PARALLEL_MIN = 16
+
+
 def _sha256_of_file(p: Path) -> str:
-    h = hashlib.sha256()
-    with p.open("rb") as f:
+    with p.open("rb", buffering=0) as f:
+        if hasattr(hashlib, "file_digest"):  # 3.11+: C read/update loop, GIL released
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
         for chunk in iter(lambda: f.read(65536), b""):
             h.update(chunk)
-    return h.hexdigest()
+        return h.hexdigest()
 
 
-def _is_excluded_dir(name: str, exclude_dirs: Iterable[str]) -> bool:
-    return name in set(exclude_dirs)
+def _sha256_or_none(p: Path) -> Optional[str]:
+    try:
+        return _sha256_of_file(p)
+    except Exception:
+        return None
 
 
-def discover_python_files(repo_root: Path, opts: Optional[WalkOptions] = None) -> List[FileInfo]:
+def ensure_sha256(fi: FileInfo) -> str:
+    """Compute and cache the digest for a FileInfo discovered with
+    compute_sha256=False."""
+    if fi.sha256 is None:
+        fi.sha256 = _sha256_of_file(Path(fi.abs_path))
+    return fi.sha256
+
+
+def iter_python_files(repo_root: Path, opts: Optional[WalkOptions] = None) -> Iterator[FileInfo]:
+    """Yield FileInfo as files are discovered and hashed, in no particular
+    order; lets callers overlap AST parsing with hashing I/O. Use
+    discover_python_files() for the sorted list."""
     opts = opts or WalkOptions()
     repo_root = repo_root.resolve()
 
@@ -110,53 +157,100 @@ def discover_python_files(repo_root: Path, opts: Optional[WalkOptions] = None) -
     repo_excludes = _read_repo_ignores(repo_root)
     exclude_globs = list(opts.exclude_globs) + repo_excludes
 
-    rel_paths: List[str] = []
+    # (rel_path, size) pairs; the scandir walk knows sizes up front, the
+    # git listing leaves them None for a later stat
+    entries: List[Tuple[str, Optional[int]]] = []
     used_git = False
 
     if opts.use_git_ls_files and (repo_root / ".git").exists():
-        rel_paths = _git_ls_files(repo_root)
-        used_git = bool(rel_paths)
+        names = _git_ls_files(repo_root)
+        if names:
+            entries = [(n, None) for n in names]
+            used_git = True
 
     if not used_git:
-        # Walk filesystem
-        for root, dirs, files in os.walk(repo_root):
-            # Prune excluded directories in-place
-            dirs[:] = [d for d in dirs if not _is_excluded_dir(d, opts.exclude_dirs)]
-            for fn in files:
-                rel = str(Path(root, fn).resolve().relative_to(repo_root))
-                rel_paths.append(rel)
-
-    # Normalize to POSIX-style
-    rel_paths = [rel.replace("\\", "/") for rel in rel_paths]
-    # Apply include globs
-    included = [rel for rel in rel_paths if _match_any(rel, opts.include_globs)]
-    # Apply exclude globs
-    if exclude_globs:
-        included = [rel for rel in included if not _match_any(rel, exclude_globs)]
-
-    out: List[FileInfo] = []
-    for rel in included:
-        abs_p = (repo_root / rel).resolve()
-        try:
-            st = abs_p.stat()
-        except Exception:
+        # Iterative scandir walk: DirEntry carries stat info from the
+        # directory read itself, so file sizes come for free instead of
+        # costing a second stat per file later
+        excl = frozenset(opts.exclude_dirs)  # built once, not per directory
+        stack: List[Tuple[str, str]] = [(str(repo_root), "")]
+        while stack:
+            cur, prefix = stack.pop()
+            try:
+                it = os.scandir(cur)
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in excl:
+                                stack.append((entry.path, prefix + entry.name + os.sep))
+                        elif entry.is_file():
+                            entries.append((prefix + entry.name, entry.stat().st_size))
+                    except OSError:
+                        continue
+
+    # Normalize to POSIX-style and apply include/exclude globs in one pass
+    # over the (possibly 100k-entry) listing
+    included: List[Tuple[str, Optional[int]]] = []
+    for rel, size in entries:
+        rel = rel.replace("\\", "/")
+        if not _match_any(rel, opts.include_globs):
             continue
-        size = int(st.st_size)
-        if opts.max_size_bytes is not None and size > int(opts.max_size_bytes):
+        if exclude_globs and _match_any(rel, exclude_globs):
             continue
-        try:
-            digest = _sha256_of_file(abs_p)
-        except Exception:
+        included.append((rel, size))
+
+    candidates: List[tuple] = []
+    for rel, size in included:
+        # repo_root is resolved above; a plain join is enough and avoids
+        # another round of per-file resolve() syscalls
+        abs_p = repo_root / rel
+        if size is None:  # git listing: size not known yet
+            try:
+                size = abs_p.stat().st_size
+            except Exception:
+                continue
+        size = int(size)
+        if opts.max_size_bytes is not None and size > int(opts.max_size_bytes):
             continue
-        out.append(FileInfo(
-            repo_root=str(repo_root),
-            rel_path=rel,
-            abs_path=str(abs_p),
-            lang="python",
-            size_bytes=size,
-            sha256=digest,
-        ))
+        candidates.append((rel, abs_p, size))
+
+    # Hashing is I/O-bound and hashlib releases the GIL, so fan it out
+    # across threads for larger repos; ex.map yields digests in input order
+    # as they complete, so files stream out while later ones still hash
+    digests: Iterable[Optional[str]]
+    ex = None
+    if not opts.compute_sha256:
+        digests = (None for _ in candidates)
+    elif len(candidates) > _HASH_PARALLEL_MIN:
+        from concurrent.futures import ThreadPoolExecutor
+        workers = min(32, (os.cpu_count() or 1) * 4)
+        ex = ThreadPoolExecutor(max_workers=workers)
+        digests = ex.map(_sha256_or_none, (p for _, p, _ in candidates))
+    else:
+        digests = (_sha256_or_none(p) for _, p, _ in candidates)
+
+    try:
+        for (rel, abs_p, size), digest in zip(candidates, digests):
+            if digest is None and opts.compute_sha256:
+                continue  # unreadable file
+            yield FileInfo(
+                repo_root=str(repo_root),
+                rel_path=rel,
+                abs_path=str(abs_p),
+                lang="python",
+                size_bytes=size,
+                sha256=digest,
+            )
+    finally:
+        if ex is not None:  # caller may abandon the generator mid-stream
+            ex.shutdown(wait=False, cancel_futures=True)
 
+
+def discover_python_files(repo_root: Path, opts: Optional[WalkOptions] = None) -> List[FileInfo]:
+    out = list(iter_python_files(repo_root, opts))
     # Deterministic order
     out.sort(key=lambda fi: fi.rel_path)
     return out
@@ -7,6 +7,11 @@ from typing import Dict, List, Optional, Set, Tuple
 
 from krpc_snippets.ingest.deps import modulize_rel_path
 
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None  # optional; loading falls back to stdlib json
+
 
 @dataclass
 class ResolveResult:
@@ -17,40 +22,70 @@ class ResolveResult:
     stats: Dict[str, int]
 
 
-def _load_snippets(path: Path) -> Tuple[List[Dict], Dict[str, Dict], Dict[str, Dict]]:
+def _load_snippets(path: Path) -> Tuple[List[Dict], Dict[str, Dict], Dict[str, Dict], Dict[str, Dict]]:
     recs: List[Dict] = []
     id_map: Dict[str, Dict] = {}
     sym_map: Dict[str, Dict] = {}
-    for line in path.read_text(encoding="utf-8").splitlines():
-        if not line.strip():
-            continue
-        r = json.loads(line)
-        recs.append(r)
-        rid = r.get("id")
-        if rid:
-            id_map[rid] = r
-        # Build symbol map
-        mod = modulize_rel_path(str(r.get("path", "")).replace("\\", "/"))
-        name = str(r.get("name", ""))
-        if name:
-            sym = f"{mod}.{name}"
-            sym_map[sym] = r
-    return recs, id_map, sym_map
+    const_by_module: Dict[str, Dict] = {}
+    loads = orjson.loads if orjson is not None else json.loads
+    # Stream the file line by line in binary: no whole-file str copy, and
+    # both decoders take bytes directly
+    with path.open("rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            r = loads(line)
+            recs.append(r)
+            rid = r.get("id")
+            if rid:
+                id_map[rid] = r
+            # Normalize once at load time; graph building re-reads these for
+            # every record several times over
+            mod = modulize_rel_path(str(r.get("path", "")).replace("\\", "/"))
+            r["_module"] = mod
+            r["_sym"] = f"{mod}.{r.get('name')}"
+            name = str(r.get("name", ""))
+            if name:
+                sym_map[f"{mod}.{name}"] = r
+            cats = r.get("categories")
+            r["_cat"] = cats[0] if cats else None
+            if r["_cat"] == "const":
+                # Keep the first const record per module, matching the old scan
+                const_by_module.setdefault(mod, r)
+    return recs, id_map, sym_map, const_by_module
+
+
+def _primary_cat(rec: Dict) -> Optional[str]:
+    # First category, cached on the record at load time; the allocation-free
+    # lookup matters because graph building asks per record several times
+    try:
+        return rec["_cat"]
+    except KeyError:
+        cats = rec.get("categories")
+        return cats[0] if cats else None
+
+
+def _module_of(rec: Dict) -> str:
+    mod = rec.get("_module")
+    if mod is None:
+        mod = modulize_rel_path(str(rec.get("path", "")).replace("\\", "/"))
+    return mod
 
 
 def _const_record_for_module(recs: List[Dict], module: str) -> Optional[Dict]:
     # Find a record with category 'const' and matching module
     for r in recs:
-        if (r.get("categories") or [None])[0] == "const":
-            mod_r = modulize_rel_path(str(r.get("path", "")).replace("\\", "/"))
-            if mod_r == module:
+        if _primary_cat(r) == "const":
+            if _module_of(r) == module:
                 return r
     return None
 
 
 def _symbol_key(rec: Dict) -> str:
-    mod = modulize_rel_path(str(rec.get("path", "")).replace("\\", "/"))
-    return f"{mod}.{rec.get('name')}"
+    sym = rec.get("_sym")
+    if sym is None:
+        sym = f"{_module_of(rec)}.{rec.get('name')}"
+    return sym
 
 
 def _class_symbol_from_method_symbol(symbol: str) -> Optional[str]:
@@ -62,20 +97,22 @@ def _class_symbol_from_method_symbol(symbol: str) -> Optional[str]:
 
 
 def _deps_for(rec: Dict) -> List[str]:
-    deps = []
+    # Dedupe in the loop: no trailing dict.fromkeys pass per graph node
+    seen: Set[str] = set()
+    deps: List[str] = []
     for d in rec.get("dependencies") or []:
         d = str(d)
         # If method dependency, depend on its class to ensure runnable code
-        cls_sym = _class_symbol_from_method_symbol(d)
-        deps.append(cls_sym or d)
+        d = _class_symbol_from_method_symbol(d) or d
+        if d not in seen:
+            seen.add(d)
+            deps.append(d)
     # If target is a method itself, include its parent class
-    cat = (rec.get("categories") or [None])[0]
-    if cat == "method":
-        sym = _symbol_key(rec)
-        cls_sym = _class_symbol_from_method_symbol(sym)
-        if cls_sym:
+    if _primary_cat(rec) == "method":
+        cls_sym = _class_symbol_from_method_symbol(_symbol_key(rec))
+        if cls_sym and cls_sym not in seen:
             deps.append(cls_sym)
-    return list(dict.fromkeys(deps))
+    return deps
 
 
 def _dfs_collect(
@@ -88,10 +125,11 @@ def _dfs_collect(
     unresolved: Set[str],
     size_cap_nodes: int,
 ) -> None:
-    if sym in visited:
+    # Iterative postorder DFS: an explicit (sym, deps-iterator) stack avoids
+    # a Python frame plus kwarg re-passing per edge and cannot hit the
+    # recursion limit on deep dependency chains.
+    if sym in visited or sym in visiting:
         return
-    if sym in visiting:
-        return  # cycle, ignore
     if len(order) >= size_cap_nodes:
         return
     rec = sym_map.get(sym)
@@ -99,14 +137,28 @@ def _dfs_collect(
         unresolved.add(sym)
         return
     visiting.add(sym)
-    for dep in _deps_for(rec):
-        _dfs_collect(dep, sym_map=sym_map, visiting=visiting, visited=visited, order=order, unresolved=unresolved, size_cap_nodes=size_cap_nodes)
-        if len(order) >= size_cap_nodes:
-            break
-    visiting.remove(sym)
-    visited.add(sym)
-    if sym not in order:
-        order.append(sym)
+    stack: List[Tuple[str, object]] = [(sym, iter(_deps_for(rec)))]
+    while stack:
+        cur, deps = stack[-1]
+        pushed = False
+        if len(order) < size_cap_nodes:  # cap stops descent, not unwinding
+            for dep in deps:
+                if dep in visited or dep in visiting:
+                    continue  # done already, or a cycle: ignore
+                drec = sym_map.get(dep)
+                if not drec:
+                    unresolved.add(dep)
+                    continue
+                visiting.add(dep)
+                stack.append((dep, iter(_deps_for(drec))))
+                pushed = True
+                break
+        if not pushed:
+            stack.pop()
+            visiting.remove(cur)
+            visited.add(cur)
+            if cur not in order:
+                order.append(cur)
 
 
 def build_dep_graph(
@@ -115,6 +167,7 @@ def build_dep_graph(
     id_map: Dict[str, Dict],
     sym_map: Dict[str, Dict],
     *,
+    const_by_module: Optional[Dict[str, Dict]] = None,
     size_cap_bytes: int = 25000,
     size_cap_nodes: int = 25,
 ) -> Tuple[List[str], List[str], bool]:
@@ -126,7 +179,7 @@ def build_dep_graph(
 
     target_sym = _symbol_key(target_rec)
     # If target is method, pivot to parent class for emission
-    if (target_rec.get("categories") or [None])[0] == "method":
+    if _primary_cat(target_rec) == "method":
         cls_sym = _class_symbol_from_method_symbol(target_sym)
         if cls_sym and cls_sym in sym_map:
             target_sym = cls_sym
@@ -140,9 +193,12 @@ def build_dep_graph(
         rec = sym_map.get(sym)
         if not rec:
             continue
-        mod = modulize_rel_path(str(rec.get("path", "")).replace("\\", "/"))
+        mod = _module_of(rec)
         if mod not in seen_modules:
-            cst = _const_record_for_module(recs, mod)
+            if const_by_module is not None:
+                cst = const_by_module.get(mod)
+            else:
+                cst = _const_record_for_module(recs, mod)
             if cst:
                 cst_sym = _symbol_key(cst)
                 if cst_sym not in to_emit_syms:
@@ -178,8 +234,8 @@ def assemble_bundle(include_ids: List[str], id_map: Dict[str, Dict]) -> str:
         rec = id_map.get(rid)
         if not rec:
             continue
-        cat = (rec.get("categories") or [None])[0]
-        mod = modulize_rel_path(str(rec.get("path", "")).replace("\\", "/"))
+        cat = _primary_cat(rec)
+        mod = _module_of(rec)
         name = rec.get("name")
         header = f"# --- {cat}: {mod} ({name})\n"
         code = rec.get("code") or ""
@@ -196,7 +252,7 @@ def resolve_snippet(
     size_cap_nodes: int = 25,
     emit_map: bool = False,
 ) -> ResolveResult:
-    recs, id_map, sym_map = _load_snippets(snippets_path)
+    recs, id_map, sym_map, const_by_module = _load_snippets(snippets_path)
     target_rec: Optional[Dict] = None
     if target_id:
         target_rec = id_map.get(target_id)
@@ -206,7 +262,7 @@ def resolve_snippet(
     if not target_rec:
         raise ValueError("Target snippet not found by id or name")
 
-    include_ids, unresolved, truncated = build_dep_graph(target_rec, recs, id_map, sym_map, size_cap_bytes=size_cap_bytes, size_cap_nodes=size_cap_nodes)
+    include_ids, unresolved, truncated = build_dep_graph(target_rec, recs, id_map, sym_map, const_by_module=const_by_module, size_cap_bytes=size_cap_bytes, size_cap_nodes=size_cap_nodes)
     bundle = assemble_bundle(include_ids, id_map)
     stats = {"nodes": len(include_ids), "bytes": len(bundle.encode("utf-8"))}
     return ResolveResult(bundle_code=bundle, include_ids=include_ids, unresolved_deps=unresolved, truncated=truncated, stats=stats)
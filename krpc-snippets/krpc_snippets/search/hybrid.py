@@ -1,21 +1,102 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import math
 import os
 import random
+import tempfile
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 from krpc_snippets.index.keyword import KeywordIndex, search as kw_search
+from krpc_snippets.utils.retry import with_retry, with_retry_async
+
+try:
+    import numpy as np  # type: ignore
+except Exception:
+    np = None  # optional; pure-Python fallbacks below
+
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None  # optional; stdlib json fallback
 
 
 @dataclass
 class VecStore:
-    vectors: Dict[str, List[float]]
+    ids: List[str]
+    # (N, dim) float32 ndarray in row order of `ids`; a List[List[float]]
+    # when numpy is unavailable. Rows are unit-norm, so matrix @ q with a
+    # normalized query is cosine similarity directly.
+    matrix: object
+    id_to_row: Dict[str, int]
     dim: int
     model: str
+    # When quantized, matrix holds int8 rows and q_scales the per-row
+    # dequantization factors; vector_search multiplies them back in
+    quantized: bool = False
+    q_scales: object = None
+
+
+def quantize_matrix(matrix: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """Symmetric per-row int8 quantization: returns (int8 matrix, scales)."""
+    scales = np.abs(matrix).max(axis=1) / 127.0
+    scales = np.where(scales > 1e-12, scales, 1.0).astype(np.float32)
+    q = np.round(matrix / scales[:, None]).astype(np.int8)
+    return q, scales
+
+
+def quantize_store(store: VecStore) -> VecStore:
+    """Return a VecStore with int8 rows: 4x less memory traffic than
+    float32 on the bandwidth-bound scoring path, at ~1% score error."""
+    if np is None or store.quantized or not len(store.ids):
+        return store
+    q, scales = quantize_matrix(store.matrix)
+    return VecStore(
+        ids=store.ids,
+        matrix=q,
+        id_to_row=store.id_to_row,
+        dim=store.dim,
+        model=store.model,
+        quantized=True,
+        q_scales=scales,
+    )
+
+
+def _make_store(ids: List[str], vecs: object, dim: int, model: str) -> VecStore:
+    # Contiguous float32 rows: vector_search becomes one matrix @ vector
+    # call instead of a Python loop over boxed floats. Normalizing once
+    # here (writers should emit unit vectors, but loaders did not enforce
+    # it) makes the plain dot product exactly cosine.
+    if np is not None:
+        if isinstance(vecs, list) and any(len(v) != dim for v in vecs):
+            # Drop rows that disagree with the store dim: they cannot form
+            # a rectangular matrix, and the old per-row dot scored them 0.0
+            kept = [(i, v) for i, v in zip(ids, vecs) if len(v) == dim]
+            ids = [i for i, _ in kept]
+            vecs = [v for _, v in kept]
+        # len() not truthiness: vecs may already be an ndarray (Parquet path)
+        matrix = np.asarray(vecs, dtype=np.float32) if len(vecs) else np.zeros((0, max(1, dim)), dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        denom = np.where(norms > 1e-12, norms, 1.0)
+        if matrix.flags.writeable:
+            matrix /= denom
+        else:  # zero-copy Arrow buffers arrive read-only
+            matrix = matrix / denom
+    else:
+        matrix = []
+        for vec in vecs:
+            s = math.sqrt(sum(x * x for x in vec)) or 1.0
+            matrix.append([x / s for x in vec])
+    return VecStore(
+        ids=ids,
+        matrix=matrix,
+        id_to_row={rid: i for i, rid in enumerate(ids)},
+        dim=dim,
+        model=model,
+    )
 
 
 def load_keyword_index(path: Path) -> KeywordIndex:
@@ -23,54 +104,178 @@ def load_keyword_index(path: Path) -> KeywordIndex:
 
 
 def load_embeddings_jsonl(path: Path) -> VecStore:
-    vectors: Dict[str, List[float]] = {}
+    ids: List[str] = []
+    vecs: List[List[float]] = []
     dim = 0
     model = ""
-    for line in path.read_text(encoding="utf-8").splitlines():
-        if not line.strip():
-            continue
-        obj = json.loads(line)
-        vid = obj.get("id")
-        vec = obj.get("vector")
-        if vid and isinstance(vec, list):
-            vectors[vid] = vec
-            dim = dim or len(vec)
-            model = model or (obj.get("model") or "")
-    return VecStore(vectors=vectors, dim=dim, model=model)
+    loads = orjson.loads if orjson is not None else json.loads
+    # Stream line by line in binary: no whole-file str copy or splitlines
+    # list, and both decoders take bytes directly
+    with path.open("rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            obj = loads(line)
+            vid = obj.get("id")
+            vec = obj.get("vector")
+            if vid and isinstance(vec, list):
+                ids.append(vid)
+                vecs.append(vec)
+                dim = dim or len(vec)
+                model = model or (obj.get("model") or "")
+    return _make_store(ids, vecs, dim, model)
 
 
 def load_embeddings_sqlite(path: Path) -> VecStore:
+    import array
     import sqlite3
     conn = sqlite3.connect(str(path))
-    vectors: Dict[str, List[float]] = {}
-    dim = 0
+    ids: List[str] = []
     model = ""
-    for rid, mdl, d, vjson in conn.execute("select id, model, dim, vector from embeddings"):
+
+    if np is not None:
+        row = conn.execute("select count(*), min(dim), max(dim) from embeddings").fetchone()
+        n, mn, mx = row if row else (0, None, None)
+        if n and mn and mn == mx:
+            # Uniform dim: size the matrix once up front and decode each
+            # float32 blob with frombuffer — one memcpy per row, no boxed
+            # floats (JSON-text rows from older DBs still parse)
+            dim = int(mx)
+            loads = orjson.loads if orjson is not None else json.loads
+            matrix = np.empty((n, dim), dtype=np.float32)
+            i = 0
+            for rid, mdl, d, vraw in conn.execute("select id, model, dim, vector from embeddings"):
+                try:
+                    if isinstance(vraw, (bytes, memoryview)):
+                        vec = np.frombuffer(vraw, dtype=np.float32)
+                    else:
+                        vec = np.asarray(loads(vraw), dtype=np.float32)
+                except Exception:
+                    continue
+                if vec.shape[0] != dim:
+                    continue
+                matrix[i] = vec
+                ids.append(rid)
+                i += 1
+                model = model or (mdl or "")
+            conn.close()
+            return _make_store(ids, matrix[:i], dim, model)
+
+    vecs: List[List[float]] = []
+    dim = 0
+    for rid, mdl, d, vraw in conn.execute("select id, model, dim, vector from embeddings"):
         try:
-            vec = json.loads(vjson)
+            if isinstance(vraw, (bytes, memoryview)):
+                # Raw float32 blob written by enrich.embed.write_sqlite
+                vec = array.array("f", vraw).tolist()
+            else:
+                vec = json.loads(vraw)  # legacy JSON-text rows
         except Exception:
             continue
-        vectors[rid] = vec
+        ids.append(rid)
+        vecs.append(vec)
         dim = dim or int(d)
         model = model or (mdl or "")
     conn.close()
-    return VecStore(vectors=vectors, dim=dim, model=model)
+    return _make_store(ids, vecs, dim, model)
 
 
 def load_embeddings_parquet(path: Path) -> VecStore:
+    import pyarrow as pa  # type: ignore
     import pyarrow.parquet as pq  # type: ignore
-    table = pq.read_table(path)
-    vectors: Dict[str, List[float]] = {}
+    table = pq.read_table(path, columns=["id", "model", "vector"])
+    n = table.num_rows
+
+    # Columnar fast path: pull the vector column's flat float buffer out in
+    # one shot and reshape, instead of to_pylist() boxing every float
+    if np is not None and n:
+        col = table.column("vector").combine_chunks()
+        id_col = table.column("id")
+        if col.null_count == 0 and id_col.null_count == 0:
+            if pa.types.is_fixed_size_list(col.type):
+                dim = int(col.type.list_size)
+                uniform = dim > 0
+            else:
+                widths = np.diff(col.offsets.to_numpy())
+                dim = int(widths[0]) if len(widths) else 0
+                uniform = dim > 0 and bool((widths == dim).all())
+            if uniform:
+                flat = col.flatten().to_numpy(zero_copy_only=False)
+                matrix = flat.astype(np.float32, copy=False).reshape(n, dim)
+                ids = id_col.to_pylist()
+                mcol = table.column("model")
+                model = mcol[0].as_py() or ""
+                if not model:
+                    model = next((m for m in mcol.to_pylist() if m), "")
+                return _make_store(ids, matrix, dim, model)
+
+    # Row-wise fallback: ragged vectors or null ids/vectors
+    ids = []
+    vecs: List[List[float]] = []
     dim = 0
     model = ""
     for row in table.to_pylist():
         rid = row.get("id")
         vec = row.get("vector")
         if rid and isinstance(vec, list):
-            vectors[rid] = vec
+            ids.append(rid)
+            vecs.append(vec)
             dim = dim or len(vec)
             model = model or (row.get("model") or "")
-    return VecStore(vectors=vectors, dim=dim, model=model)
+    return _make_store(ids, vecs, dim, model)
+
+
+def _vecstore_meta_path(path: Path) -> Path:
+    return path.with_suffix(".meta.json")
+
+
+def save_vecstore(path: Path, store: VecStore) -> None:
+    """Dump a VecStore as a raw .npy matrix plus a .meta.json sidecar.
+
+    The .npy holds the already-normalized rows, so load_vecstore_mmap can
+    map it read-only with no parse or normalize pass.
+    """
+    if np is None:
+        raise RuntimeError("numpy is required to save a VecStore. Install with 'uv pip install numpy'.")
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.save(path.with_suffix(".npy"), np.ascontiguousarray(store.matrix))
+    if store.quantized:
+        np.save(path.with_suffix(".scales.npy"), store.q_scales)
+    meta = {
+        "ids": list(store.ids),
+        "dim": store.dim,
+        "model": store.model,
+        "quantized": bool(store.quantized),
+    }
+    _vecstore_meta_path(path).write_text(json.dumps(meta), encoding="utf-8")
+
+
+def load_vecstore_mmap(path: Path) -> VecStore:
+    """Load a VecStore saved by save_vecstore with the matrix mmap'd.
+
+    np.load(..., mmap_mode='r') maps pages on demand, so startup cost is
+    O(1) instead of reading and allocating the whole matrix — the scan in
+    vector_search streams it from the page cache anyway. Suited to CLI
+    tools that exit after one query.
+    """
+    if np is None:
+        raise RuntimeError("numpy is required to mmap a VecStore. Install with 'uv pip install numpy'.")
+    path = Path(path)
+    meta = json.loads(_vecstore_meta_path(path).read_text(encoding="utf-8"))
+    matrix = np.load(path.with_suffix(".npy"), mmap_mode="r")
+    ids = meta["ids"]
+    store = VecStore(
+        ids=ids,
+        matrix=matrix,
+        id_to_row={rid: i for i, rid in enumerate(ids)},
+        dim=int(meta.get("dim") or (matrix.shape[1] if matrix.ndim == 2 else 0)),
+        model=meta.get("model") or "",
+    )
+    if meta.get("quantized"):
+        store.quantized = True
+        store.q_scales = np.load(path.with_suffix(".scales.npy"), mmap_mode="r")
+    return store
 
 
 def _openai_client_or_none():
@@ -87,7 +292,40 @@ def _openai_client_or_none():
         return None
 
 
+def _query_cache_path(cache_dir: Path, model: str, text: str) -> Path:
+    key = hashlib.sha256(f"{model}|{text}".encode("utf-8")).hexdigest()
+    # Raw float32, not JSON: 4x smaller and loads with one frombuffer
+    return cache_dir / f"{key}.f32"
+
+
+def _vec_to_f32_bytes(v: List[float]) -> bytes:
+    if np is not None:
+        return np.asarray(v, dtype=np.float32).tobytes()
+    import array
+    return array.array("f", v).tobytes()
+
+
+def _vec_from_f32_bytes(blob: bytes) -> List[float]:
+    if np is not None:
+        return np.frombuffer(blob, dtype=np.float32).tolist()
+    import array
+    a = array.array("f")
+    a.frombytes(blob)
+    return a.tolist()
+
+
 def embed_query(text: str, *, model: str, dim: int, mock: bool, cache_dir: Optional[Path] = None) -> List[float]:
+    cache_path: Optional[Path] = None
+    if cache_dir is not None and not mock:
+        cache_path = _query_cache_path(Path(cache_dir), model, text)
+        try:
+            blob = cache_path.read_bytes()
+        except OSError:
+            blob = b""
+        if blob:
+            return _vec_from_f32_bytes(blob)
+
+    from_api = False
     if mock:
         rnd = random.Random(hash(text + model) & 0xFFFFFFFF)
         v = [rnd.uniform(-1.0, 1.0) for _ in range(max(1, dim))]
@@ -99,14 +337,115 @@ def embed_query(text: str, *, model: str, dim: int, mock: bool, cache_dir: Optio
             v = [rnd.uniform(-1.0, 1.0) for _ in range(max(1, dim))]
         else:
             try:
-                resp = client.embeddings.create(model=model, input=[text])
+                # Transient failures (429s, dropped connections) back off
+                # and retry instead of collapsing straight to mock
+                resp = with_retry(lambda: client.embeddings.create(model=model, input=[text]))
                 v = list(resp.data[0].embedding)
+                from_api = True
             except Exception:
                 rnd = random.Random(hash(text + model) & 0xFFFFFFFF)
                 v = [rnd.uniform(-1.0, 1.0) for _ in range(max(1, dim))]
     # L2 normalize
     s = math.sqrt(sum(x * x for x in v)) or 1.0
-    return [x / s for x in v]
+    out = [x / s for x in v]
+
+    # Only real API responses are worth persisting; mock fallbacks are
+    # deterministic and caching one would mask a later-working key
+    if cache_path is not None and from_api:
+        _write_query_cache(cache_path, out)
+    return out
+
+
+def _write_query_cache(cache_path: Path, vec: List[float]) -> None:
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Atomic write: write to temp and rename, mirroring write_jsonl
+        fd, tmpname = tempfile.mkstemp(prefix=cache_path.name + ".", dir=str(cache_path.parent))
+        os.close(fd)
+        tmp = Path(tmpname)
+        tmp.write_bytes(_vec_to_f32_bytes(vec))
+        tmp.replace(cache_path)
+    except Exception:
+        pass
+
+
+def _async_openai_client_or_none():
+    try:
+        from openai import AsyncOpenAI  # type: ignore
+    except Exception:
+        return None
+    key = os.environ.get("OPENAI_API_KEY")
+    if not key:
+        return None
+    try:
+        return AsyncOpenAI(api_key=key)
+    except Exception:
+        return None
+
+
+async def embed_queries(
+    texts: List[str],
+    *,
+    model: str,
+    dim: int,
+    mock: bool,
+    cache_dir: Optional[Path] = None,
+    batch_size: int = 1024,
+    max_concurrency: int = 5,
+) -> List[List[float]]:
+    """Embed many query strings at once: cache hits are resolved up front,
+    the misses go to the API in batches of ``batch_size`` texts, and up to
+    ``max_concurrency`` batches are in flight concurrently. Falls back to
+    embed_query per text when no async client is available."""
+    import asyncio
+
+    out: List[Optional[List[float]]] = [None] * len(texts)
+    pending: List[int] = []
+    for i, text in enumerate(texts):
+        if cache_dir is not None and not mock:
+            cache_path = _query_cache_path(Path(cache_dir), model, text)
+            try:
+                blob = cache_path.read_bytes()
+            except OSError:
+                blob = b""
+            if blob:
+                out[i] = _vec_from_f32_bytes(blob)
+                continue
+        pending.append(i)
+
+    client = None if mock else _async_openai_client_or_none()
+    if client is None:
+        for i in pending:
+            out[i] = embed_query(texts[i], model=model, dim=dim, mock=mock, cache_dir=cache_dir)
+        return out  # type: ignore[return-value]
+
+    sem = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run_batch(idxs: List[int]) -> None:
+        async with sem:
+            try:
+                resp = await with_retry_async(
+                    lambda: client.embeddings.create(model=model, input=[texts[i] for i in idxs])
+                )
+                vecs: Optional[List[List[float]]] = [list(d.embedding) for d in resp.data]
+            except Exception:
+                vecs = None
+        for j, i in enumerate(idxs):
+            if vecs is None or j >= len(vecs):
+                # Same deterministic fallback embed_query uses on failure
+                out[i] = embed_query(texts[i], model=model, dim=dim, mock=True)
+                continue
+            v = vecs[j]
+            s = math.sqrt(sum(x * x for x in v)) or 1.0
+            vec = [x / s for x in v]
+            out[i] = vec
+            if cache_dir is not None:
+                _write_query_cache(_query_cache_path(Path(cache_dir), model, texts[i]), vec)
+
+    bs = max(1, batch_size)
+    batches = [pending[s:s + bs] for s in range(0, len(pending), bs)]
+    await asyncio.gather(*(run_batch(b) for b in batches))
+    return out  # type: ignore[return-value]
 
 
 def _cosine(a: List[float], b: List[float]) -> float:
@@ -116,17 +455,49 @@ def _cosine(a: List[float], b: List[float]) -> float:
 
 
 def vector_search(store: VecStore, qvec: List[float], k: int = 10) -> List[Tuple[str, float]]:
-    scores: List[Tuple[str, float]] = []
-    for rid, vec in store.vectors.items():
-        sc = _cosine(vec, qvec)
-        scores.append((rid, sc))
-    scores.sort(key=lambda kv: -kv[1])
-    return scores[:k]
+    n = len(store.ids)
+    if n == 0:
+        return []
+    if np is not None:
+        if store.matrix.shape[1] != len(qvec):
+            # Dimension mismatch scored 0.0 per document before the
+            # matrix layout; keep that behavior
+            return [(rid, 0.0) for rid in store.ids[:k]]
+        q = np.asarray(qvec, dtype=np.float32)
+        if store.quantized:
+            # Symmetric int8 dot; int32 accumulation keeps it portable
+            # and dequantization is two broadcast multiplies
+            q_scale = float(np.abs(q).max() / 127.0) or 1.0
+            q_q = np.round(q / q_scale).astype(np.int8)
+            scores = np.matmul(store.matrix, q_q, dtype=np.int32).astype(np.float32)
+            scores *= store.q_scales * np.float32(q_scale)
+        else:
+            scores = store.matrix @ q  # one BLAS gemv over all documents
+        k2 = min(k, n)
+        if k2 < n:
+            # O(N) top-k selection, then sort just the k survivors
+            top = np.argpartition(-scores, k2 - 1)[:k2]
+            top = top[np.argsort(-scores[top], kind="stable")]
+        else:
+            top = np.argsort(-scores, kind="stable")
+        return [(store.ids[i], float(scores[i])) for i in top]
+    pairs = [(rid, _cosine(vec, qvec)) for rid, vec in zip(store.ids, store.matrix)]
+    pairs.sort(key=lambda kv: -kv[1])
+    return pairs[:k]
 
 
 def _minmax_norm(pairs: List[Tuple[str, float]]) -> Dict[str, float]:
     if not pairs:
         return {}
+    if np is not None:
+        scores = np.fromiter((sc for _, sc in pairs), dtype=np.float64, count=len(pairs))
+        mn = float(scores.min())
+        mx = float(scores.max())
+        if mx - mn <= 1e-12:
+            return {rid: 1.0 for rid, _ in pairs}
+        normed = (scores - mn) / (mx - mn)
+        # tolist() converts in C; the dict is built exactly once
+        return dict(zip((rid for rid, _ in pairs), normed.tolist()))
     vals = [sc for _, sc in pairs]
     mn = min(vals)
     mx = max(vals)
@@ -158,19 +529,17 @@ def search_hybrid(
     vec = vector_search(store, qvec, k=k * 3)
     vec_norm = _minmax_norm(vec)
 
-    # Combine ids
-    ids = set(list(kw_norm.keys()) + list(vec_norm.keys()))
-    # Apply filters to ids not present in kw results
-    def doc_ok(doc: Dict) -> bool:
-        if exclude_restricted and doc.get("restricted"):
-            return False
-        if category and (category not in (doc.get("categories") or [])):
-            return False
-        return True
-
-    for rid in list(ids):
-        if rid not in idx.docs or not doc_ok(idx.docs[rid]):
-            ids.discard(rid)
+    # Combine ids: dict_keys support set union directly, no throwaway lists
+    ids = kw_norm.keys() | vec_norm.keys()
+    # Apply filters (vector hits were never filtered) in a single pass
+    docs = idx.docs
+    ids = {
+        rid
+        for rid in ids
+        if rid in docs
+        and not (exclude_restricted and docs[rid].get("restricted"))
+        and (not category or category in (docs[rid].get("categories") or []))
+    }
 
     fused: List[Tuple[str, float]] = []
     for rid in ids:
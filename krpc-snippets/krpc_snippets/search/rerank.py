@@ -8,6 +8,8 @@ from hashlib import sha256
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+from krpc_snippets.utils.retry import with_retry, with_retry_async
+
 
 @dataclass
 class RerankConfig:
@@ -28,11 +30,19 @@ def prepare_candidates(query: str, hybrid_results: List[Dict], top_m: int) -> Li
     # Trim to Top-M with minimal fields
     items: List[Dict] = []
     for row in hybrid_results[: max(1, top_m)]:
+        name = row.get("name")
+        categories = row.get("categories") or []
+        description = (row.get("preview") or name or "")[:200]
         items.append({
             "id": row.get("id"),
-            "name": row.get("name"),
-            "categories": row.get("categories") or [],
-            "description": (row.get("preview") or row.get("name") or "")[:200],
+            "name": name,
+            "categories": categories,
+            "description": description,
+            # Tokenized once here so mock_rerank does not re-scan the same
+            # candidate text per query; stripped before any API payload
+            "_tokens": frozenset(_tokenize(" ".join(
+                [name or "", description, " ".join(str(x) for x in categories)]
+            ))),
         })
     return items
 
@@ -45,7 +55,7 @@ def _build_messages(query: str, candidates: List[Dict]) -> List[Dict[str, str]]:
     )
     user = json.dumps({
         "query": query,
-        "candidates": candidates,
+        "candidates": [{k: v for k, v in c.items() if not k.startswith("_")} for c in candidates],
         "instructions": "Score each candidate id with a 0..1 float. Return: {\"items\": [{\"id\":..., \"score\":...}, ...]}"
     }, ensure_ascii=False)
     return [
@@ -86,25 +96,16 @@ def call_openai_rerank(cfg: RerankConfig, query: str, candidates: List[Dict]) ->
     if client is None:
         return mock_rerank(query, candidates)
     try:
-        resp = client.chat.completions.create(
+        # Retry transient failures with backoff; the mock fallback below is
+        # kept only for permanent errors
+        resp = with_retry(lambda: client.chat.completions.create(
             model=cfg.model,
             temperature=cfg.temperature,
             response_format={"type": "json_object"},
             max_tokens=cfg.max_output_tokens,
             messages=_build_messages(query, candidates),
-        )
-        txt = resp.choices[0].message.content or "{}"
-        obj = json.loads(txt)
-        out: Dict[str, float] = {}
-        for it in obj.get("items", []) or []:
-            rid = str(it.get("id"))
-            sc = float(it.get("score", 0.0))
-            # clamp
-            if sc < 0.0:
-                sc = 0.0
-            if sc > 1.0:
-                sc = 1.0
-            out[rid] = sc
+        ))
+        out = _parse_rerank_response(resp.choices[0].message.content or "{}")
         # Cache
         try:
             cache_path.write_text(json.dumps(out, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
@@ -115,20 +116,84 @@ def call_openai_rerank(cfg: RerankConfig, query: str, candidates: List[Dict]) ->
         return mock_rerank(query, candidates)
 
 
+def _async_openai_client_or_none():
+    try:
+        from openai import AsyncOpenAI  # type: ignore
+    except Exception:
+        return None
+    key = os.environ.get("OPENAI_API_KEY")
+    if not key:
+        return None
+    try:
+        return AsyncOpenAI(api_key=key)
+    except Exception:
+        return None
+
+
+def _parse_rerank_response(txt: str) -> Dict[str, float]:
+    obj = json.loads(txt)
+    out: Dict[str, float] = {}
+    for it in obj.get("items", []) or []:
+        rid = str(it.get("id"))
+        sc = float(it.get("score", 0.0))
+        # clamp
+        if sc < 0.0:
+            sc = 0.0
+        if sc > 1.0:
+            sc = 1.0
+        out[rid] = sc
+    return out
+
+
+async def call_openai_rerank_async(cfg: RerankConfig, query: str, candidates: List[Dict]) -> Dict[str, float]:
+    """Async mirror of call_openai_rerank, for callers that gather many
+    queries concurrently (e.g. the evaluation harness)."""
+    cache_path = _cache_key(cfg, query, candidates)
+    if cache_path.exists():
+        try:
+            return json.loads(cache_path.read_text(encoding="utf-8"))
+        except Exception:
+            pass
+    client = _async_openai_client_or_none()
+    if client is None:
+        return mock_rerank(query, candidates)
+    try:
+        resp = await with_retry_async(lambda: client.chat.completions.create(
+            model=cfg.model,
+            temperature=cfg.temperature,
+            response_format={"type": "json_object"},
+            max_tokens=cfg.max_output_tokens,
+            messages=_build_messages(query, candidates),
+        ))
+        out = _parse_rerank_response(resp.choices[0].message.content or "{}")
+        try:
+            cache_path.write_text(json.dumps(out, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        except Exception:
+            pass
+        return out
+    except Exception:
+        return mock_rerank(query, candidates)
+
+
+_TOKEN_RE = re.compile(r"[A-Za-z0-9_]+")
+
+
 def _tokenize(s: str) -> List[str]:
-    return re.findall(r"[A-Za-z0-9_]+", s.lower())
+    return _TOKEN_RE.findall(s.lower())
 
 
 def mock_rerank(query: str, candidates: List[Dict]) -> Dict[str, float]:
     qt = set(_tokenize(query))
     out: Dict[str, float] = {}
     for c in candidates:
-        text = " ".join([
-            c.get("name") or "",
-            c.get("description") or "",
-            " ".join([str(x) for x in (c.get("categories") or [])])
-        ]).lower()
-        toks = set(_tokenize(text))
+        # prepare_candidates pre-tokenizes; fall back for ad-hoc callers
+        toks = c.get("_tokens")
+        if toks is None:
+            toks = set(_tokenize(" ".join([
+                c.get("name") or "",
+                c.get("description") or "",
+                " ".join([str(x) for x in (c.get("categories") or [])])
+            ])))
         overlap = len(qt & toks)
         sc = 0.0 if not qt else min(1.0, overlap / max(1.0, len(qt)))
         out[str(c.get("id"))] = sc
@@ -8,9 +8,42 @@ from typing import Iterable, Iterator, Dict, Any
 
 from .validation import validate_snippet
 
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None  # optional; stdlib json fallback
+
 
 _OPT_KEYS = ("restricted", "inputs", "outputs", "when_to_use", "size_bytes", "lines_of_code")
 
+# Buffer lines and flush in ~256 KiB chunks to amortize write syscalls
+_FLUSH_BYTES = 256 * 1024
+
+
+def _dump_line(obj: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj) + b"\n"
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _write_records(f, snippets: Iterable[Dict[str, Any]], validate: bool) -> int:
+    written = 0
+    buf = bytearray()
+    for obj in snippets:
+        obj = _prune_nones(obj)
+        if validate:
+            errs = validate_snippet(obj)
+            if errs and not all(e.startswith("jsonschema not installed") for e in errs):
+                raise ValueError("Invalid snippet: " + "; ".join(errs))
+        buf += _dump_line(obj)
+        written += 1
+        if len(buf) >= _FLUSH_BYTES:
+            f.write(buf)
+            del buf[:]
+    if buf:
+        f.write(buf)
+    return written
+
 
 def _prune_nones(obj: Dict[str, Any]) -> Dict[str, Any]:
     o = dict(obj)
@@ -35,17 +68,12 @@ def write_jsonl(snippets: Iterable[Dict[str, Any]], path: str | Path, *, append:
         fd, tmpname = tempfile.mkstemp(prefix=p.name + ".", dir=str(p.parent))
         os.close(fd)
         tmp = Path(tmpname)
-        written = 0
         try:
-            with tmp.open("w", encoding="utf-8") as f:
-                for obj in snippets:
-                    obj = _prune_nones(obj)
-                    if validate:
-                        errs = validate_snippet(obj)
-                        if errs and not all(e.startswith("jsonschema not installed") for e in errs):
-                            raise ValueError("Invalid snippet: " + "; ".join(errs))
-                    f.write(json.dumps(obj, ensure_ascii=False) + "\n")
-                    written += 1
+            with tmp.open("wb") as f:
+                written = _write_records(f, snippets, validate)
+                # Durable before the rename makes it visible
+                f.flush()
+                os.fsync(f.fileno())
             tmp.replace(p)
             return written
         finally:
@@ -55,17 +83,8 @@ def write_jsonl(snippets: Iterable[Dict[str, Any]], path: str | Path, *, append:
                 except Exception:
                     pass
     else:
-        written = 0
-        with p.open("a", encoding="utf-8") as f:
-            for obj in snippets:
-                obj = _prune_nones(obj)
-                if validate:
-                    errs = validate_snippet(obj)
-                    if errs and not all(e.startswith("jsonschema not installed") for e in errs):
-                        raise ValueError("Invalid snippet: " + "; ".join(errs))
-                f.write(json.dumps(obj, ensure_ascii=False) + "\n")
-                written += 1
-        return written
+        with p.open("ab") as f:
+            return _write_records(f, snippets, validate)
 
 
 def iter_jsonl(path: str | Path, *, validate: bool = False) -> Iterator[Dict[str, Any]]:
@@ -18,6 +18,43 @@ def _ensure_pyarrow():
 _ARRAY_FIELDS = ("categories", "dependencies", "inputs", "outputs")
 
 
+def _schema(pa):
+    # Shared by the data and empty-table branches
+    return pa.schema([
+        ("id", pa.string()),
+        ("repo", pa.string()),
+        ("commit", pa.string()),
+        ("path", pa.string()),
+        ("lang", pa.string()),
+        ("name", pa.string()),
+        ("description", pa.string()),
+        ("code", pa.string()),
+        ("categories", pa.list_(pa.string())),
+        ("dependencies", pa.list_(pa.string())),
+        ("license", pa.string()),
+        ("license_url", pa.string()),
+        ("created_at", pa.string()),
+        ("restricted", pa.bool_()),
+        ("inputs", pa.list_(pa.string())),
+        ("outputs", pa.list_(pa.string())),
+        ("when_to_use", pa.string()),
+        ("size_bytes", pa.int64()),
+        ("lines_of_code", pa.int64()),
+    ])
+
+
+def _columnize(rows: List[Dict[str, Any]], names: List[str]) -> Dict[str, List[Any]]:
+    # One pass over rows filling parallel column lists, instead of one
+    # full pass per column
+    columns: Dict[str, List[Any]] = {n: [] for n in names}
+    appends = [(n, columns[n].append) for n in names]
+    for r in rows:
+        get = r.get
+        for n, append in appends:
+            append(get(n))
+    return columns
+
+
 def _normalize_record(rec: Dict[str, Any]) -> Dict[str, Any]:
     obj = dict(rec)
     # Ensure optional fields exist (nullable)
@@ -33,99 +70,43 @@ def _normalize_record(rec: Dict[str, Any]) -> Dict[str, Any]:
     return obj
 
 
-def write_parquet(snippets: Iterable[Dict[str, Any]], path: str | Path, *, validate: bool = False) -> int:
+def write_parquet(snippets: Iterable[Dict[str, Any]], path: str | Path, *, validate: bool = False, chunk_size: int = 10_000) -> int:
     pa, pq = _ensure_pyarrow()
     p = Path(path)
     p.parent.mkdir(parents=True, exist_ok=True)
-    rows: List[Dict[str, Any]] = []
-    count = 0
+    from itertools import islice
     from .validation import validate_snippet
 
-    for rec in snippets:
-        if validate:
-            errs = validate_snippet(rec)
-            if errs and not all(e.startswith("jsonschema not installed") for e in errs):
-                raise ValueError("Invalid snippet: " + "; ".join(errs))
-        rows.append(_normalize_record(rec))
-        count += 1
-
-    if not rows:
-        # Write empty table with schema inferred from _example
-        fields = [
-            ("id", pa.string()),
-            ("repo", pa.string()),
-            ("commit", pa.string()),
-            ("path", pa.string()),
-            ("lang", pa.string()),
-            ("name", pa.string()),
-            ("description", pa.string()),
-            ("code", pa.string()),
-            ("categories", pa.list_(pa.string())),
-            ("dependencies", pa.list_(pa.string())),
-            ("license", pa.string()),
-            ("license_url", pa.string()),
-            ("created_at", pa.string()),
-            ("restricted", pa.bool_()),
-            ("inputs", pa.list_(pa.string())),
-            ("outputs", pa.list_(pa.string())),
-            ("when_to_use", pa.string()),
-            ("size_bytes", pa.int64()),
-            ("lines_of_code", pa.int64()),
-        ]
-        schema = pa.schema([(n, t) for n, t in fields])
-        empty = pa.Table.from_arrays([pa.array([], type=t) for _, t in fields], names=[n for n, _ in fields])
-        pq.write_table(empty, p)
-        return 0
-
-    # Build columns
-    def col(name: str, typ):
-        return pa.array([r.get(name) for r in rows], type=typ)
-
-    table = pa.Table.from_arrays(
-        [
-            col("id", pa.string()),
-            col("repo", pa.string()),
-            col("commit", pa.string()),
-            col("path", pa.string()),
-            col("lang", pa.string()),
-            col("name", pa.string()),
-            col("description", pa.string()),
-            col("code", pa.string()),
-            col("categories", pa.list_(pa.string())),
-            col("dependencies", pa.list_(pa.string())),
-            col("license", pa.string()),
-            col("license_url", pa.string()),
-            col("created_at", pa.string()),
-            col("restricted", pa.bool_()),
-            col("inputs", pa.list_(pa.string())),
-            col("outputs", pa.list_(pa.string())),
-            col("when_to_use", pa.string()),
-            col("size_bytes", pa.int64()),
-            col("lines_of_code", pa.int64()),
-        ],
-        names=[
-            "id",
-            "repo",
-            "commit",
-            "path",
-            "lang",
-            "name",
-            "description",
-            "code",
-            "categories",
-            "dependencies",
-            "license",
-            "license_url",
-            "created_at",
-            "restricted",
-            "inputs",
-            "outputs",
-            "when_to_use",
-            "size_bytes",
-            "lines_of_code",
-        ],
-    )
-    pq.write_table(table, p)
+    schema = _schema(pa)
+    count = 0
+    it = iter(snippets)
+    # Stream chunk-at-a-time through one ParquetWriter so peak memory is
+    # bounded by chunk_size rows instead of the whole catalog
+    writer = None
+    try:
+        while True:
+            chunk = list(islice(it, chunk_size))
+            if not chunk:
+                break
+            rows: List[Dict[str, Any]] = []
+            for rec in chunk:
+                if validate:
+                    errs = validate_snippet(rec)
+                    if errs and not all(e.startswith("jsonschema not installed") for e in errs):
+                        raise ValueError("Invalid snippet: " + "; ".join(errs))
+                rows.append(_normalize_record(rec))
+            # from_pydict bulk-converts each column in C++; no per-column
+            # Python comprehension over the rows
+            batch = pa.RecordBatch.from_pydict(_columnize(rows, schema.names), schema=schema)
+            if writer is None:
+                writer = pq.ParquetWriter(p, schema)
+            writer.write_batch(batch)
+            count += len(rows)
+        if writer is None:  # empty input still yields a valid file
+            pq.write_table(schema.empty_table(), p)
+    finally:
+        if writer is not None:
+            writer.close()
     return count
 
 
@@ -3,7 +3,12 @@ from __future__ import annotations
 import json
 import sqlite3
 from pathlib import Path
-from typing import Iterable, Iterator, Dict, Any, Optional
+from typing import Iterable, Iterator, Dict, Any, List, Optional
+
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None  # optional; stdlib json fallback
 
 
 def open_db(path: str | Path) -> sqlite3.Connection:
@@ -13,6 +18,9 @@ def open_db(path: str | Path) -> sqlite3.Connection:
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL;")
     conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    conn.execute("PRAGMA cache_size=-64000;")  # 64 MiB page cache
+    conn.execute("PRAGMA mmap_size=268435456;")  # 256 MiB
     return conn
 
 
@@ -45,9 +53,54 @@ def init_schema(conn: sqlite3.Connection) -> None:
     conn.execute("CREATE INDEX IF NOT EXISTS idx_snippets_commit ON snippets(commit_sha);")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_snippets_repo ON snippets(repo);")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_snippets_lang ON snippets(lang);")
+    # Normalized category rows so query() can use an index instead of a
+    # LIKE scan over the JSON text column
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS snippet_categories (
+            snippet_id TEXT NOT NULL,
+            category TEXT NOT NULL,
+            PRIMARY KEY (snippet_id, category)
+        );
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_sc_cat ON snippet_categories(category);")
+    # Backfill for databases written before the side table existed
+    (n_cat,) = conn.execute("SELECT COUNT(*) FROM snippet_categories").fetchone()
+    if n_cat == 0:
+        pairs = []
+        for rid, cats in conn.execute("SELECT id, categories FROM snippets"):
+            try:
+                for c in json.loads(cats) or []:
+                    pairs.append((rid, str(c)))
+            except Exception:
+                continue
+        if pairs:
+            conn.executemany(
+                "INSERT OR IGNORE INTO snippet_categories (snippet_id, category) VALUES (?, ?)",
+                pairs,
+            )
     conn.commit()
 
 
+def _sync_categories(conn: sqlite3.Connection, recs: Iterable[Dict[str, Any]]) -> None:
+    ids = []
+    pairs = []
+    for r in recs:
+        rid = r.get("id")
+        if not rid:
+            continue
+        ids.append((rid,))
+        for c in r.get("categories") or []:
+            pairs.append((rid, str(c)))
+    # Delete-then-insert keeps upserted rows from leaving stale categories
+    conn.executemany("DELETE FROM snippet_categories WHERE snippet_id = ?", ids)
+    conn.executemany(
+        "INSERT OR IGNORE INTO snippet_categories (snippet_id, category) VALUES (?, ?)",
+        pairs,
+    )
+
+
 def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
     obj = dict(row)
     # Map DB column commit_sha -> schema field commit
@@ -67,20 +120,36 @@ def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
     return obj
 
 
-def _encode_arrays(obj: Dict[str, Any]) -> Dict[str, Any]:
-    out = dict(obj)
-    # Ensure optional nullable keys exist for parameter binding
-    for k in ("restricted", "inputs", "outputs", "when_to_use", "size_bytes", "lines_of_code"):
-        out.setdefault(k, None)
-    for k in ("categories", "dependencies", "inputs", "outputs"):
-        v = out.get(k)
-        if v is None:
-            out[k] = None
-        else:
-            out[k] = json.dumps(list(v))
-    if out.get("restricted") is not None:
-        out["restricted"] = 1 if out["restricted"] else 0
-    return out
+if orjson is not None:
+    def _dump_list(v: Any) -> str:
+        return orjson.dumps(list(v)).decode()
+else:
+    def _dump_list(v: Any) -> str:
+        return json.dumps(list(v))
+
+
+def _encode_rows(recs: Iterable[Dict[str, Any]]) -> List[tuple]:
+    # Encode straight into binding tuples in snippets-column order: no
+    # dict(obj) copy or setdefault churn per row
+    rows: List[tuple] = []
+    for r in recs:
+        cats = r.get("categories")
+        deps = r.get("dependencies")
+        inputs = r.get("inputs")
+        outputs = r.get("outputs")
+        restricted = r.get("restricted")
+        rows.append((
+            r.get("id"), r.get("repo"), r.get("commit"), r.get("path"),
+            r.get("lang"), r.get("name"), r.get("description"), r.get("code"),
+            None if cats is None else _dump_list(cats),
+            None if deps is None else _dump_list(deps),
+            r.get("license"), r.get("license_url"), r.get("created_at"),
+            None if restricted is None else (1 if restricted else 0),
+            None if inputs is None else _dump_list(inputs),
+            None if outputs is None else _dump_list(outputs),
+            r.get("when_to_use"), r.get("size_bytes"), r.get("lines_of_code"),
+        ))
+    return rows
 
 
 def upsert_snippet(conn: sqlite3.Connection, rec: Dict[str, Any], *, validate: bool = False) -> None:
@@ -91,44 +160,40 @@ def upsert_snippet(conn: sqlite3.Connection, rec: Dict[str, Any], *, validate: b
         if errs and not all(e.startswith("jsonschema not installed") for e in errs):
             raise ValueError("Invalid snippet: " + "; ".join(errs))
 
-    r = _encode_arrays(rec)
-    conn.execute(
-        """
-        INSERT INTO snippets (
-            id, repo, commit_sha, path, lang, name, description, code,
-            categories, dependencies, license, license_url, created_at,
-            restricted, inputs, outputs, when_to_use, size_bytes, lines_of_code
-        ) VALUES (
-            :id, :repo, :commit, :path, :lang, :name, :description, :code,
-            :categories, :dependencies, :license, :license_url, :created_at,
-            :restricted, :inputs, :outputs, :when_to_use, :size_bytes, :lines_of_code
-        )
-        ON CONFLICT(id) DO UPDATE SET
-            repo=excluded.repo,
-            commit_sha=excluded.commit_sha,
-            path=excluded.path,
-            lang=excluded.lang,
-            name=excluded.name,
-            description=excluded.description,
-            code=excluded.code,
-            categories=excluded.categories,
-            dependencies=excluded.dependencies,
-            license=excluded.license,
-            license_url=excluded.license_url,
-            created_at=excluded.created_at,
-            restricted=excluded.restricted,
-            inputs=excluded.inputs,
-            outputs=excluded.outputs,
-            when_to_use=excluded.when_to_use,
-            size_bytes=excluded.size_bytes,
-            lines_of_code=excluded.lines_of_code
-        ;
-        """,
-        r,
-    )
+    conn.execute(_BULK_INSERT_SQL, _encode_rows([rec])[0])
+    _sync_categories(conn, [rec])
     conn.commit()
 
 
+_BULK_INSERT_SQL = """
+    INSERT INTO snippets (
+        id, repo, commit_sha, path, lang, name, description, code,
+        categories, dependencies, license, license_url, created_at,
+        restricted, inputs, outputs, when_to_use, size_bytes, lines_of_code
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        repo=excluded.repo,
+        commit_sha=excluded.commit_sha,
+        path=excluded.path,
+        lang=excluded.lang,
+        name=excluded.name,
+        description=excluded.description,
+        code=excluded.code,
+        categories=excluded.categories,
+        dependencies=excluded.dependencies,
+        license=excluded.license,
+        license_url=excluded.license_url,
+        created_at=excluded.created_at,
+        restricted=excluded.restricted,
+        inputs=excluded.inputs,
+        outputs=excluded.outputs,
+        when_to_use=excluded.when_to_use,
+        size_bytes=excluded.size_bytes,
+        lines_of_code=excluded.lines_of_code
+    ;
+"""
+
+
 def bulk_insert(conn: sqlite3.Connection, recs: Iterable[Dict[str, Any]], *, validate: bool = False, batch_size: int = 500) -> int:
     from itertools import islice
 
@@ -142,55 +207,21 @@ def bulk_insert(conn: sqlite3.Connection, recs: Iterable[Dict[str, Any]], *, val
                 return
             yield buf
 
-    for chunked in chunk(recs, batch_size):
-        to_write = []
-        if validate:
-            from .validation import validate_snippet
-
-            for r in chunked:
-                errs = validate_snippet(r)
-                if errs and not all(e.startswith("jsonschema not installed") for e in errs):
-                    raise ValueError("Invalid snippet: " + "; ".join(errs))
-                to_write.append(_encode_arrays(r))
-        else:
-            to_write = [_encode_arrays(r) for r in chunked]
-
-        conn.executemany(
-            """
-            INSERT INTO snippets (
-                id, repo, commit_sha, path, lang, name, description, code,
-                categories, dependencies, license, license_url, created_at,
-                restricted, inputs, outputs, when_to_use, size_bytes, lines_of_code
-            ) VALUES (
-                :id, :repo, :commit, :path, :lang, :name, :description, :code,
-                :categories, :dependencies, :license, :license_url, :created_at,
-                :restricted, :inputs, :outputs, :when_to_use, :size_bytes, :lines_of_code
-            )
-            ON CONFLICT(id) DO UPDATE SET
-                repo=excluded.repo,
-                commit_sha=excluded.commit_sha,
-                path=excluded.path,
-                lang=excluded.lang,
-                name=excluded.name,
-                description=excluded.description,
-                code=excluded.code,
-                categories=excluded.categories,
-                dependencies=excluded.dependencies,
-                license=excluded.license,
-                license_url=excluded.license_url,
-                created_at=excluded.created_at,
-                restricted=excluded.restricted,
-                inputs=excluded.inputs,
-                outputs=excluded.outputs,
-                when_to_use=excluded.when_to_use,
-                size_bytes=excluded.size_bytes,
-                lines_of_code=excluded.lines_of_code
-            ;
-            """,
-            to_write,
-        )
-        total += len(to_write)
-        conn.commit()
+    # One transaction for the whole insert: per-batch commits forced an
+    # fsync each, which dominated large loads
+    with conn:
+        for chunked in chunk(recs, batch_size):
+            if validate:
+                from .validation import validate_snippet
+
+                for r in chunked:
+                    errs = validate_snippet(r)
+                    if errs and not all(e.startswith("jsonschema not installed") for e in errs):
+                        raise ValueError("Invalid snippet: " + "; ".join(errs))
+
+            conn.executemany(_BULK_INSERT_SQL, _encode_rows(chunked))
+            _sync_categories(conn, chunked)
+            total += len(chunked)
     return total
 
 
@@ -214,19 +245,21 @@ def query(
     license: Optional[str] = None,
     limit: int = 100,
 ) -> list[Dict[str, Any]]:
-    sql = "SELECT * FROM snippets"
+    sql = "SELECT s.* FROM snippets s"
     where = []
     params: list[Any] = []  # type: ignore[name-defined]
+    if category:
+        # Indexed lookup via the normalized side table instead of a LIKE
+        # scan over the JSON text column
+        sql += " JOIN snippet_categories sc ON sc.snippet_id = s.id"
+        where.append("sc.category = ?")
+        params.append(category)
     if lang:
-        where.append("lang = ?")
+        where.append("s.lang = ?")
         params.append(lang)
     if license:
-        where.append("license = ?")
+        where.append("s.license = ?")
         params.append(license)
-    if category:
-        # Simple LIKE search on JSON-encoded list
-        where.append("categories LIKE ?")
-        params.append(f'%"{category}"%')
     if where:
         sql += " WHERE " + " AND ".join(where)
     sql += " LIMIT ?"
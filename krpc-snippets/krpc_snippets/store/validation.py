@@ -13,20 +13,50 @@ def _load_schema() -> Dict[str, Any]:
     return json.loads(schema_path.read_text(encoding="utf-8"))
 
 
+@lru_cache(maxsize=1)
+def _fast_validator():
+    """Compiled fastjsonschema function, or None if unavailable.
+
+    fastjsonschema emits a Python function specialized to the schema and
+    runs several times faster than jsonschema's generic walker.
+    """
+    try:
+        import fastjsonschema  # type: ignore
+
+        return fastjsonschema.compile(_load_schema())
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=1)
+def _validator():
+    """Draft7Validator built once; construction compiles the schema's ref
+    graph, which is too slow to repeat per record in bulk loads."""
+    import jsonschema  # type: ignore
+
+    return jsonschema.Draft7Validator(_load_schema(), format_checker=jsonschema.FormatChecker())
+
+
 def validate_snippet(obj: Dict[str, Any]) -> List[str]:
     """Return a list of validation error messages. Empty list means valid.
 
     Lazy-imports jsonschema to keep core import light.
     """
+    fast = _fast_validator()
+    if fast is not None:
+        try:
+            fast(obj)
+            return []
+        except Exception as e:
+            loc = "/".join(str(x) for x in getattr(e, "path", [])[1:]) or "<root>"
+            return [f"{loc}: {getattr(e, 'message', str(e))}"]
     try:
-        import jsonschema  # type: ignore
+        validator = _validator()
     except Exception as e:  # pragma: no cover - optional dependency missing
         return [
             "jsonschema not installed — install with 'uv pip install jsonschema' to validate",
             f"Import error: {e}",
         ]
-    schema = _load_schema()
-    validator = jsonschema.Draft7Validator(schema)
     errs = []
     for err in sorted(validator.iter_errors(obj), key=lambda e: e.path):
         loc = "/".join(str(x) for x in err.path) or "<root>"
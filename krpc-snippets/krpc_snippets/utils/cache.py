@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Callable
+
+
+def cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "krpc_snippets"
+
+
+def _file_key(src_path: Path, version: int) -> str:
+    # Content hash, not mtime: rebuilding the same snippets file hits the
+    # same cache entry, and any edit invalidates it
+    h = hashlib.sha256()
+    h.update(src_path.read_bytes())
+    h.update(f"|v{version}".encode("ascii"))
+    return h.hexdigest()
+
+
+def load_or_build(src_path: str | Path, builder: Callable[[Path], Any], *, name: str, version: int = 1) -> Any:
+    """Memoize builder(src_path) as a pickle keyed by the source file hash.
+
+    Repeated benchmark/eval invocations skip the parse-and-build step
+    entirely. Cache failures (unwritable dir, stale pickle format) fall
+    back to building; they never fail the caller.
+    """
+    src_path = Path(src_path)
+    try:
+        cpath = cache_dir() / f"{name}-{_file_key(src_path, version)}.pkl"
+        if cpath.exists():
+            with cpath.open("rb") as f:
+                return pickle.load(f)
+    except Exception:
+        return builder(src_path)
+    obj = builder(src_path)
+    try:
+        cpath.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmpname = tempfile.mkstemp(prefix=cpath.name + ".", dir=str(cpath.parent))
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmpname, cpath)
+    except Exception:
+        pass
+    return obj
+
+
+def load_or_build_vecstore(src_path: str | Path, builder: Callable[[Path], Any], *, version: int = 1) -> Any:
+    """Like load_or_build, but persists the store via save_vecstore so the
+    matrix reloads as an mmap'd .npy — near-instant startup and pages
+    shared with other processes through the OS page cache."""
+    from krpc_snippets.search.hybrid import load_vecstore_mmap, save_vecstore
+
+    src_path = Path(src_path)
+    try:
+        base = cache_dir() / f"vecstore-{_file_key(src_path, version)}"
+        if base.with_suffix(".meta.json").exists():
+            return load_vecstore_mmap(base)
+    except Exception:
+        return builder(src_path)
+    store = builder(src_path)
+    try:
+        base.parent.mkdir(parents=True, exist_ok=True)
+        save_vecstore(base, store)
+    except Exception:
+        pass
+    return store
@@ -1,25 +1,20 @@
 from __future__ import annotations
 
+import mmap
 import os
+import re
 from pathlib import Path
 from typing import Dict
 
-
-def _parse_env_line(line: str) -> tuple[str, str] | None:
-    s = line.strip()
-    if not s or s.startswith("#"):
-        return None
-    if s.startswith("export "):
-        s = s[len("export "):].lstrip()
-    if "=" not in s:
-        return None
-    key, val = s.split("=", 1)
-    key = key.strip()
-    val = val.strip()
-    # Trim surrounding single/double quotes if present
-    if (val.startswith("\"") and val.endswith("\"")) or (val.startswith("'") and val.endswith("'")):
-        val = val[1:-1]
-    return key, val
+# One compiled pass over the raw bytes: each line is `KEY=value` with an
+# optional `export ` prefix and optional single/double quotes around the
+# value. Comment and malformed lines simply never match. \r is treated
+# as trailing whitespace so CRLF files parse like the old line splitter.
+_ENV_RE = re.compile(
+    rb"^[ \t]*(?:export[ \t]+)?([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*"
+    rb"(?:\"([^\"\r\n]*)\"|'([^'\r\n]*)'|([^\r\n]*))[ \t\r]*$",
+    re.M,
+)
 
 
 def load_env_defaults() -> Dict[str, str]:
@@ -35,16 +30,31 @@ def load_env_defaults() -> Dict[str, str]:
     set_vars: Dict[str, str] = {}
     try:
         if env_path.exists():
-            for line in env_path.read_text(encoding="utf-8").splitlines():
-                kv = _parse_env_line(line)
-                if not kv:
-                    continue
-                k, v = kv
-                if k not in os.environ:
-                    os.environ[k] = v
-                    set_vars[k] = v
+            with env_path.open("rb") as f:
+                try:
+                    # Scan the mapped bytes directly; no full-file decode
+                    # or per-line Python strip/split
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    return set_vars  # empty file cannot be mapped
+                with mm:
+                    for m in _ENV_RE.finditer(mm):
+                        k = m.group(1).decode("utf-8")
+                        if m.group(2) is not None:
+                            v = m.group(2).decode("utf-8")
+                        elif m.group(3) is not None:
+                            v = m.group(3).decode("utf-8")
+                        else:
+                            v = (m.group(4) or b"").decode("utf-8").strip()
+                            # Values with interior quotes fall through to
+                            # this group; trim a surrounding pair like the
+                            # old line parser did
+                            if v and v[0] in "\"'" and v[-1] == v[0]:
+                                v = v[1:-1]
+                        if k not in os.environ:
+                            os.environ[k] = v
+                            set_vars[k] = v
     except Exception:
         # Best-effort only; ignore parse/read errors
         pass
     return set_vars
-
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+import mmap
+from pathlib import Path
+from typing import Any, Dict, List
+
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None  # optional; stdlib json fallback
+
+
+if orjson is not None:
+    def dump_line(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+else:
+    def dump_line(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+# Flush writelines in batches of this many buffered pieces to amortize
+# write syscalls on large emissions
+_WRITE_BATCH = 2048
+
+
+def write_jsonl_stream(records, out) -> int:
+    """Write records as JSONL to a binary stream (e.g. sys.stdout.buffer).
+
+    Serializes with orjson when installed and batches lines through
+    writelines, instead of one dumps + encode + write syscall per record.
+    """
+    buf: List[bytes] = []
+    n = 0
+    for r in records:
+        buf.append(dump_line(r))
+        buf.append(b"\n")
+        n += 1
+        if len(buf) >= _WRITE_BATCH:
+            out.writelines(buf)
+            buf.clear()
+    if buf:
+        out.writelines(buf)
+    out.flush()
+    return n
+
+
+def load_jsonl(path: str | Path) -> List[Dict[str, Any]]:
+    """Bulk-parse a JSONL file into a list of dicts.
+
+    Maps the file instead of read_text(): the bytes stay in the page
+    cache with no decoded-str copy of the whole file, and lines are
+    split at the byte level. orjson parses each line when installed.
+    """
+    loads = orjson.loads if orjson is not None else json.loads
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return []  # empty file cannot be mapped
+        with mm:
+            out: List[Dict[str, Any]] = []
+            line = mm.readline()
+            while line:
+                if line.strip():
+                    out.append(loads(line))
+                line = mm.readline()
+            return out
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def _retriable_exceptions() -> Tuple[type, ...]:
+    # Only rate limits and connection drops are worth retrying; auth or
+    # request errors are permanent and should surface immediately
+    try:
+        import openai  # type: ignore
+        return (openai.RateLimitError, openai.APIConnectionError)
+    except Exception:
+        return ()
+
+
+def _retry_after_seconds(exc: Exception) -> float:
+    # 429 responses often carry a Retry-After header; honor it when present
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if headers is None:
+        return 0.0
+    try:
+        return float(headers.get("retry-after") or 0.0)
+    except Exception:
+        return 0.0
+
+
+def _backoff(exc: Exception, attempt: int, base: float) -> float:
+    return max(_retry_after_seconds(exc), base * (2 ** attempt) + random.uniform(0.0, 0.5))
+
+
+def with_retry(fn: Callable[[], T], *, attempts: int = 5, base: float = 1.0) -> T:
+    """Call ``fn``, retrying transient OpenAI failures with exponential
+    backoff and jitter. The last attempt re-raises, so callers keep their
+    own permanent-failure fallbacks."""
+    retriable = _retriable_exceptions()
+    if not retriable:
+        return fn()
+    for attempt in range(attempts - 1):
+        try:
+            return fn()
+        except retriable as exc:
+            time.sleep(_backoff(exc, attempt, base))
+    return fn()
+
+
+async def with_retry_async(fn: Callable[[], Awaitable[T]], *, attempts: int = 5, base: float = 1.0) -> T:
+    """Async mirror of with_retry for AsyncOpenAI call sites."""
+    retriable = _retriable_exceptions()
+    if not retriable:
+        return await fn()
+    for attempt in range(attempts - 1):
+        try:
+            return await fn()
+        except retriable as exc:
+            await asyncio.sleep(_backoff(exc, attempt, base))
+    return await fn()
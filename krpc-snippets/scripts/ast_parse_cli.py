@@ -2,11 +2,55 @@
 from __future__ import annotations
 
 import argparse
-import json
+import dataclasses
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
 from pathlib import Path
 from typing import Optional, List
 
 from krpc_snippets.ingest.python_ast import parse_python_module
+from krpc_snippets.utils.cache import cache_dir
+from krpc_snippets.utils.jsonl_io import dump_line
+
+
+def _parse_cached(path: Path):
+    """parse_python_module memoized on disk, keyed by source hash plus
+    Python version. Build pipelines invoke this CLI many times over
+    unchanged files; hits skip the parse entirely."""
+    try:
+        key = hashlib.sha256(path.read_bytes()).hexdigest() + f"-py{sys.version_info.major}{sys.version_info.minor}"
+        cpath = cache_dir() / "ast" / key[:2] / f"{key}.pkl"
+        if cpath.exists():
+            with cpath.open("rb") as f:
+                return pickle.load(f)
+    except Exception:
+        return parse_python_module(path)
+    mod = parse_python_module(path)
+    try:
+        cpath.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmpname = tempfile.mkstemp(prefix=cpath.name + ".", dir=str(cpath.parent))
+        with os.fdopen(fd, "wb") as f:
+            # The retained ast.Module would dominate the pickle; nothing
+            # in this CLI reads it
+            pickle.dump(dataclasses.replace(mod, tree=None), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmpname, cpath)
+    except Exception:
+        pass
+    return mod
+
+
+def _to_dict(o):
+    """Plain-dict view of the module summary, without the old
+    json.dumps/json.loads round trip. Skips the retained AST (not
+    serializable) and lazy underscore caches."""
+    if dataclasses.is_dataclass(o):
+        return {k: _to_dict(v) for k, v in vars(o).items() if k != "tree" and not k.startswith("_")}
+    if isinstance(o, (list, tuple)):
+        return [_to_dict(v) for v in o]
+    return o
 
 
 def main(argv: Optional[List[str]] = None) -> int:
@@ -18,15 +62,16 @@ def main(argv: Optional[List[str]] = None) -> int:
     p.add_argument("--functions", action="store_true", help="Print function names with line spans")
     p.add_argument("--classes", action="store_true", help="Print class names and methods with spans")
     p.add_argument("--consts", action="store_true", help="Print const block span and names")
+    p.add_argument("--no-cache", action="store_true", help="Bypass the on-disk AST cache")
 
     args = p.parse_args(argv)
     path = Path(args.path)
     if not path.exists():
         print(f"Not found: {path}")
         return 1
-    mod = parse_python_module(path)
+    mod = parse_python_module(path) if args.no_cache else _parse_cached(path)
     if args.json:
-        data = json.loads(json.dumps(mod, default=lambda o: o.__dict__, ensure_ascii=False))
+        data = _to_dict(mod)
         if args.no_code:
             # Remove code_span fields
             for fn in data.get("functions", []) or []:
@@ -37,7 +82,8 @@ def main(argv: Optional[List[str]] = None) -> int:
                     m.pop("code_span", None)
             for cb in data.get("const_blocks", []) or []:
                 cb.pop("code_span", None)
-        print(json.dumps(data, ensure_ascii=False))
+        sys.stdout.buffer.write(dump_line(data) + b"\n")
+        sys.stdout.buffer.flush()
         return 0
     if args.summary:
         print(f"functions={len(mod.functions)} classes={len(mod.classes)} const_blocks={len(mod.const_blocks)} parse_error={mod.parse_error is not None}")
@@ -7,15 +7,7 @@ import sys
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
-
-def _load_jsonl(path: Path) -> list[dict]:
-    items: list[dict] = []
-    for line in path.read_text(encoding="utf-8").splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        items.append(json.loads(line))
-    return items
+from krpc_snippets.utils.jsonl_io import load_jsonl
 
 
 def _is_gpl_family(spdx: str) -> bool:
@@ -33,7 +25,7 @@ def main(argv: Optional[List[str]] = None) -> int:
 
     args = p.parse_args(argv)
     path = Path(args.snippets)
-    recs = _load_jsonl(path)
+    recs = load_jsonl(path)
 
     by_license: dict[str, int] = {}
     restricted_ids: list[str] = []
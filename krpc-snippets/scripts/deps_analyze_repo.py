@@ -2,25 +2,15 @@
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 from pathlib import Path
 from typing import Optional, List
 
 from krpc_snippets.ingest.deps import build_symbol_index, resolve_dependencies, attach_deps_to_records
-from krpc_snippets.ingest.extract_snippets import extract_from_repo, ExtractOptions
+from krpc_snippets.ingest.extract_snippets import extract_from_repo, parse_repo, ExtractOptions
 from krpc_snippets.store import jsonl as jsonl_store
 from krpc_snippets.store.validation import validate_snippet
-
-
-def _load_jsonl(path: Path) -> List[dict]:
-    items: List[dict] = []
-    for line in path.read_text(encoding="utf-8").splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        items.append(json.loads(line))
-    return items
+from krpc_snippets.utils.jsonl_io import load_jsonl, write_jsonl_stream
 
 
 def main(argv: Optional[List[str]] = None) -> int:
@@ -40,16 +30,18 @@ def main(argv: Optional[List[str]] = None) -> int:
         print(f"Root not found: {root}", file=sys.stderr)
         return 1
 
-    # Load or extract records
+    # Parse each module once and share the ASTs across extraction, symbol
+    # indexing and dependency resolution
+    modules = parse_repo(root)
     if args.snippets:
-        recs = _load_jsonl(Path(args.snippets))
+        recs = load_jsonl(Path(args.snippets))
     else:
         opts = ExtractOptions()
-        recs = extract_from_repo(root, repo_url=args.repo_url, commit=args.commit, opts=opts)
+        recs = extract_from_repo(root, repo_url=args.repo_url, commit=args.commit, opts=opts, modules=modules)
 
     # Build symbol index and dependency map
-    sym = build_symbol_index(root)
-    dep_map = resolve_dependencies(root, symbol_index=sym)
+    sym = build_symbol_index(root, modules=modules)
+    dep_map = resolve_dependencies(root, symbol_index=sym, modules=modules)
     out_recs = attach_deps_to_records(recs, dep_map)
 
     if args.validate:
@@ -60,8 +52,7 @@ def main(argv: Optional[List[str]] = None) -> int:
                 return 2
 
     if args.out == "-":
-        for r in out_recs:
-            print(json.dumps(r, ensure_ascii=False))
+        write_jsonl_stream(out_recs, sys.stdout.buffer)
     else:
         jsonl_store.write_jsonl(out_recs, args.out, append=False, validate=args.validate)
         print(f"Wrote {len(out_recs)} records to {args.out}")
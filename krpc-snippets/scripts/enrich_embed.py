@@ -7,18 +7,9 @@ import os
 from pathlib import Path
 from typing import Optional, List
 
-from krpc_snippets.enrich.embed import EmbedConfig, embed_records, write_sqlite, write_jsonl, write_parquet
+from krpc_snippets.enrich.embed import EmbedConfig, embed_records, write_sqlite, write_jsonl, write_parquet, write_faiss_flat
 from krpc_snippets.utils.env import load_env_defaults
-
-
-def _load_jsonl(path: Path) -> list[dict]:
-    recs: list[dict] = []
-    for line in path.read_text(encoding="utf-8").splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        recs.append(json.loads(line))
-    return recs
+from krpc_snippets.utils.jsonl_io import load_jsonl
 
 
 def main(argv: Optional[List[str]] = None) -> int:
@@ -29,6 +20,7 @@ def main(argv: Optional[List[str]] = None) -> int:
     p.add_argument("--out-sqlite", dest="out_sqlite")
     p.add_argument("--out-jsonl", dest="out_jsonl")
     p.add_argument("--out-parquet", dest="out_parquet")
+    p.add_argument("--out-faiss", dest="out_faiss", help="Raw (N, dim) float32 matrix + .ids sidecar for FAISS")
     p.add_argument("--model", default="text-embedding-3-small")
     p.add_argument("--fields", default="name,description,code_head")
     p.add_argument("--code-head-chars", type=int, default=800)
@@ -38,11 +30,11 @@ def main(argv: Optional[List[str]] = None) -> int:
     p.add_argument("--mock", action="store_true")
 
     args = p.parse_args(argv)
-    outputs = [args.out_sqlite, args.out_jsonl, args.out_parquet]
+    outputs = [args.out_sqlite, args.out_jsonl, args.out_parquet, args.out_faiss]
     if not any(outputs):
-        p.error("At least one of --out-sqlite/--out-jsonl/--out-parquet is required")
+        p.error("At least one of --out-sqlite/--out-jsonl/--out-parquet/--out-faiss is required")
 
-    records = _load_jsonl(Path(args.infile))
+    records = load_jsonl(Path(args.infile))
     fields = [s.strip() for s in args.fields.split(",") if s.strip()]
     cfg = EmbedConfig(
         model=args.model,
@@ -61,6 +53,8 @@ def main(argv: Optional[List[str]] = None) -> int:
         write_jsonl(embeddings, Path(args.out_jsonl))
     if args.out_parquet:
         write_parquet(embeddings, Path(args.out_parquet))
+    if args.out_faiss:
+        write_faiss_flat(embeddings, Path(args.out_faiss))
     print(f"Wrote {n} embeddings ({args.model})")
     return 0
 
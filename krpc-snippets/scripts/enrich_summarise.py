@@ -12,16 +12,7 @@ from krpc_snippets.enrich.summarise import SummarizerConfig, summarise_snippets
 from krpc_snippets.utils.env import load_env_defaults
 from krpc_snippets.store import jsonl as jsonl_store
 from krpc_snippets.store.validation import validate_snippet
-
-
-def _load_jsonl(path: Path) -> list[dict]:
-    items: list[dict] = []
-    for line in path.read_text(encoding="utf-8").splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        items.append(json.loads(line))
-    return items
+from krpc_snippets.utils.jsonl_io import load_jsonl
 
 
 def main(argv: Optional[List[str]] = None) -> int:
@@ -37,7 +28,7 @@ def main(argv: Optional[List[str]] = None) -> int:
     p.add_argument("--validate", action="store_true")
 
     args = p.parse_args(argv)
-    records = _load_jsonl(Path(args.infile))
+    records = load_jsonl(Path(args.infile))
     cfg = SummarizerConfig(
         model=args.model,
         mock=bool(args.mock or not os.environ.get("OPENAI_API_KEY")),
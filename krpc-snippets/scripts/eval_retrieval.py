@@ -14,32 +14,26 @@ from krpc_snippets.search.hybrid import (
     search_hybrid,
 )
 from krpc_snippets.eval.metrics import topk_accuracy, mrr, ndcg_at_k
-
-
-def _load_jsonl(path: Path) -> list[dict]:
-    items: list[dict] = []
-    for line in path.read_text(encoding="utf-8").splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        items.append(json.loads(line))
-    return items
+from krpc_snippets.utils.cache import load_or_build, load_or_build_vecstore
+from krpc_snippets.utils.jsonl_io import load_jsonl
 
 
 def _load_keyword_index(idx_path: Optional[Path], snippets_path: Path) -> KeywordIndex:
     if idx_path and idx_path.exists():
         return KeywordIndex.load(idx_path)
-    recs = _load_jsonl(snippets_path)
-    return build_index(recs)
+    # Cached on disk keyed by the snippets file hash, so repeated runs
+    # skip the JSONL parse and index build
+    return load_or_build(snippets_path, lambda p: build_index(load_jsonl(p)), name="kwindex")
 
 
 def _load_vec_store(sqlite: Optional[Path], jsonl: Optional[Path], parquet: Optional[Path]):
+    # Same keying; the matrix comes back as an mmap'd .npy on cache hits
     if sqlite and sqlite.exists():
-        return load_embeddings_sqlite(sqlite)
+        return load_or_build_vecstore(sqlite, load_embeddings_sqlite)
     if jsonl and jsonl.exists():
-        return load_embeddings_jsonl(jsonl)
+        return load_or_build_vecstore(jsonl, load_embeddings_jsonl)
     if parquet and parquet.exists():
-        return load_embeddings_parquet(parquet)
+        return load_or_build_vecstore(parquet, load_embeddings_parquet)
     return None
 
 
@@ -67,7 +61,7 @@ def main(argv: Optional[List[str]] = None) -> int:
                           Path(args.embeddings_jsonl) if args.embeddings_jsonl else None,
                           Path(args.embeddings_parquet) if args.embeddings_parquet else None)
     mode = args.mode or ("hybrid" if vec is not None else "keyword")
-    queries = _load_jsonl(qpath)
+    queries = load_jsonl(qpath)
 
     per: List[Dict[str, Any]] = []
     acc1 = acc3 = acc5 = mrr_sum = ndcg10_sum = 0.0
@@ -88,11 +82,12 @@ def main(argv: Optional[List[str]] = None) -> int:
                 rows = rerank_results(text, rows, RerankConfig(mock=False))
 
         ids = [r.get("id") for r in rows]
-        a1 = topk_accuracy(ids, expected, 1)
-        a3 = topk_accuracy(ids, expected, 3)
-        a5 = topk_accuracy(ids, expected, 5)
-        mm = mrr(ids, expected)
-        nd = ndcg_at_k(ids, expected, 10)
+        exp = frozenset(str(x) for x in expected)  # shared across all five metric calls
+        a1 = topk_accuracy(ids, expected, 1, _exp=exp)
+        a3 = topk_accuracy(ids, expected, 3, _exp=exp)
+        a5 = topk_accuracy(ids, expected, 5, _exp=exp)
+        mm = mrr(ids, expected, _exp=exp)
+        nd = ndcg_at_k(ids, expected, 10, _exp=exp)
         acc1 += a1; acc3 += a3; acc5 += a5; mrr_sum += mm; ndcg10_sum += nd
         per.append({"qid": qid, "text": text, "top_ids": ids, "top1": a1, "top3": a3, "top5": a5, "mrr": mm, "ndcg@10": nd})
 
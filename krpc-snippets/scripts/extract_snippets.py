@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 from pathlib import Path
 from typing import Optional, List
@@ -14,6 +13,7 @@ from krpc_snippets.ingest.extract_snippets import (
 )
 from krpc_snippets.store import jsonl as jsonl_store
 from krpc_snippets.store.validation import validate_snippet
+from krpc_snippets.utils.jsonl_io import write_jsonl_stream
 
 
 def main(argv: Optional[List[str]] = None) -> int:
@@ -71,8 +71,7 @@ def main(argv: Optional[List[str]] = None) -> int:
                 return 2
 
     if args.out == "-":
-        for r in recs:
-            print(json.dumps(r, ensure_ascii=False))
+        write_jsonl_stream(recs, sys.stdout.buffer)
         return 0
     else:
         n = jsonl_store.write_jsonl(recs, args.out, append=False, validate=args.validate)
@@ -7,16 +7,7 @@ from pathlib import Path
 from typing import Optional, Dict, Any, List
 
 from krpc_snippets.ingest.git_fetch import fetch_repo, slugify_repo, write_manifest
-
-
-def _load_jsonl(path: Path) -> List[Dict[str, Any]]:
-    items: List[Dict[str, Any]] = []
-    for line in path.read_text(encoding="utf-8").splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        items.append(json.loads(line))
-    return items
+from krpc_snippets.utils.jsonl_io import load_jsonl
 
 
 def main(argv: Optional[list[str]] = None) -> int:
@@ -37,7 +28,7 @@ def main(argv: Optional[list[str]] = None) -> int:
     if args.url:
         tasks.append({"url": args.url, "branch": args.branch, "sha": args.sha, "depth": args.depth})
     else:
-        tasks = _load_jsonl(Path(args.file))
+        tasks = load_jsonl(Path(args.file))
 
     ok = True
     for t in tasks:
@@ -14,16 +14,7 @@ from krpc_snippets.governance.license import (
 )
 from krpc_snippets.store import jsonl as jsonl_store
 from krpc_snippets.store.validation import validate_snippet
-
-
-def _load_jsonl(path: Path) -> list[dict]:
-    items: list[dict] = []
-    for line in path.read_text(encoding="utf-8").splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        items.append(json.loads(line))
-    return items
+from krpc_snippets.utils.jsonl_io import load_jsonl
 
 
 def main(argv: Optional[List[str]] = None) -> int:
@@ -55,7 +46,7 @@ def main(argv: Optional[List[str]] = None) -> int:
         return 0
 
     # Enrich JSONL
-    recs = _load_jsonl(Path(args.snippets))
+    recs = load_jsonl(Path(args.snippets))
     enriched = enrich_snippets_with_license(recs, lic, only_if_unknown=args.only_if_unknown)
     if args.validate:
         for r in enriched:
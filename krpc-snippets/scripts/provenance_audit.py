@@ -7,19 +7,10 @@ import sys
 from pathlib import Path
 from typing import Optional, List
 
-from krpc_snippets.ingest.provenance import audit_record, fix_record, build_provenance_map
+from krpc_snippets.ingest.provenance import audit_many, fix_record, build_provenance_map
 from krpc_snippets.store import jsonl as jsonl_store
 from krpc_snippets.store.validation import validate_snippet
-
-
-def _load_jsonl(path: Path) -> list[dict]:
-    items: list[dict] = []
-    for line in path.read_text(encoding="utf-8").splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        items.append(json.loads(line))
-    return items
+from krpc_snippets.utils.jsonl_io import load_jsonl
 
 
 def main(argv: Optional[List[str]] = None) -> int:
@@ -42,12 +33,11 @@ def main(argv: Optional[List[str]] = None) -> int:
         print(f"Root not found: {root}", file=sys.stderr)
         return 1
     in_path = Path(args.snippets)
-    recs = _load_jsonl(in_path)
+    recs = load_jsonl(in_path)
 
     missing = bad = mismatch = unresolved = 0
     fixed: list[dict] = []
-    for r in recs:
-        rep = audit_record(r, root, args.repo_url, args.commit)
+    for r, rep in zip(recs, audit_many(recs, root, args.repo_url, args.commit)):
         missing += int(rep.missing_provenance)
         bad += int(rep.bad_path)
         mismatch += int(rep.id_mismatch)
@@ -13,6 +13,7 @@ from krpc_snippets.search.hybrid import (
     load_embeddings_jsonl,
     load_embeddings_sqlite,
     load_embeddings_parquet,
+    quantize_store,
     search_hybrid,
 )
 
@@ -35,6 +36,7 @@ def main(argv: Optional[List[str]] = None) -> int:
     p.add_argument("--exclude-restricted", action="store_true")
     p.add_argument("--model", default=None, help="Embedding model for query text")
     p.add_argument("--mock", action="store_true", help="Use mock embedding for query")
+    p.add_argument("--quantize", action="store_true", help="Quantize embeddings to int8 (less memory, ~1%% score error)")
     # Reranker options
     p.add_argument("--rerank", action="store_true")
     p.add_argument("--beta-rerank", type=float, default=0.7)
@@ -50,6 +52,8 @@ def main(argv: Optional[List[str]] = None) -> int:
         store = load_embeddings_jsonl(Path(args.embeddings_jsonl))
     else:
         store = load_embeddings_parquet(Path(args.embeddings_parquet))
+    if args.quantize:
+        store = quantize_store(store)
 
     res = search_hybrid(
         idx,
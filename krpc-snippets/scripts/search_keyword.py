@@ -27,6 +27,8 @@ def main(argv: Optional[List[str]] = None) -> int:
     b.add_argument("--in", dest="infile", required=True)
     b.add_argument("--out", dest="outfile", required=True)
     b.add_argument("--code-head-chars", type=int, default=300)
+    b.add_argument("--wtf-cache", dest="wtf_cache", default=None,
+                   help="Side-car JSON of per-snippet term weights; unchanged snippets skip re-tokenization")
 
     q = sub.add_parser("query", help="Search an existing index file")
     q.add_argument("--index", required=True)
@@ -46,7 +48,7 @@ def main(argv: Optional[List[str]] = None) -> int:
     if args.cmd == "build":
         cfg = KeywordConfig(code_head_chars=int(args.code_head_chars))
         recs = _load_jsonl(Path(args.infile))
-        idx = build_index(recs, cfg)
+        idx = build_index(recs, cfg, wtf_cache_path=Path(args.wtf_cache) if args.wtf_cache else None)
         KeywordIndex.save(idx, Path(args.outfile))
         print(f"Index saved: {args.outfile} (docs={idx.N})")
         return 0